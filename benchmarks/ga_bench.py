@@ -0,0 +1,222 @@
+# Benchmark cho hàm fitness, các toán tử GA và một lần chạy GA đầy đủ.
+#   python benchmarks/ga_bench.py                       (chạy đủ ma trận, so với benchmarks/baseline.json)
+#   python benchmarks/ga_bench.py --quick -o out.json   (ma trận nhỏ, ghi kết quả ra file)
+#   python benchmarks/ga_bench.py --save-baseline       (ghi kết quả hiện tại làm baseline mới)
+# Exit code 1 nếu có phép đo chậm hơn baseline quá ngưỡng --tolerance.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from problem.genetic import GeneticAlgorithm
+from problem.knapsack import KnapsackProblem
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Ma trận kích thước: số vật phẩm x kích thước quần thể; số thế hệ cho lần chạy đầy đủ
+ITEM_COUNTS = (10, 100, 1000, 10000)
+POPULATION_SIZES = (50, 200)
+GENERATION_COUNTS = (20, 100)
+QUICK = {"items": (10, 100, 1000), "populations": (50,), "generations": (20,)}
+
+CROSSOVERS = ("one_point", "two_points", "uniform")
+SELECTIONS = ("tournament", "random", "roulette")
+MUTATIONS = ("uniform", "scramble")
+
+
+def make_problem(n_items, seed=0):
+    # Bài toán ngẫu nhiên cố định theo seed; sức chứa ~ 1/4 tổng trọng lượng tối đa
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 50, n_items)
+    values = rng.integers(1, 100, n_items)
+    quantities = rng.integers(1, 5, n_items)
+    items = [
+        {"number": i + 1, "name": f"item{i}", "weight": int(w), "value": int(v), "Max_quantity": int(q)}
+        for i, (w, v, q) in enumerate(zip(weights, values, quantities))
+    ]
+    return KnapsackProblem(items, capacity=int((weights * quantities).sum() // 4))
+
+
+def time_call(func, min_time=0.05, repeat=3):
+    # Thời gian trung bình mỗi lần gọi (giây): lấy lần đo tốt nhất trong repeat lần,
+    # mỗi lần gọi lặp lại đến khi đủ min_time
+    best = float("inf")
+    for _ in range(repeat):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def make_ga(problem, population, generations=1, **params):
+    params = dict(dict(crossoverType="uniform", selectionType="tournament", mutationType="uniform"), **params)
+    ga = GeneticAlgorithm(problem, population, generations, representation="array", seed=0, **params)
+    ga.start()
+    ga.evaluate_generation(1)
+    return ga
+
+
+def bench_fitness(problem, population):
+    ga = make_ga(problem, population)
+    matrix = ga.population.copy()
+    rows = matrix[:min(len(matrix), 20)].tolist()
+    scalar = time_call(lambda: [problem.fitness(row) for row in rows]) / len(rows)
+    batch = time_call(lambda: problem.fitness_batch(matrix))
+    return {
+        "fitness": {"seconds": scalar, "evaluations_per_sec": 1 / scalar},
+        "fitness_batch": {"seconds": batch, "evaluations_per_sec": len(matrix) / batch},
+    }
+
+
+def bench_operators(problem, population):
+    # Mỗi toán tử đo trên cả quần thể giao phối của một thế hệ (đường chạy representation='array')
+    results = {}
+    num_pairs = population // 2
+    for selection in SELECTIONS:
+        ga = make_ga(problem, population, selectionType=selection)
+        def select():
+            ga._cumulative_fitness = None  # roulette dựng lại bảng tích luỹ mỗi thế hệ
+            ga.select_parent_indices(population)
+        results[f"selection.{selection}"] = {"seconds": time_call(select)}
+
+    for crossover in CROSSOVERS:
+        ga = make_ga(problem, population, crossoverType=crossover)
+        parents = ga.select_parent_indices(2 * num_pairs)
+        children = np.empty((2 * num_pairs, ga.population.shape[1]), dtype=ga.population.dtype)
+        seconds = time_call(lambda: ga.crossover_batch(parents[0::2], parents[1::2], children[:num_pairs], children[num_pairs:]))
+        results[f"crossover.{crossover}"] = {"seconds": seconds}
+
+    for mutation in MUTATIONS:
+        for sampling in ("mask", "geometric"):
+            if mutation == "scramble" and sampling == "geometric":
+                continue  # scramble không dùng cách chọn gene
+            ga = make_ga(problem, population, mutationType=mutation, mutationSampling=sampling)
+            children = ga.population.copy()
+            name = f"mutation.{mutation}" + (f".{sampling}" if mutation == "uniform" else "")
+            results[name] = {"seconds": time_call(lambda: ga.mutate_batch(children))}
+    return results
+
+
+def bench_run(problem, population, generations, representation):
+    def make():
+        return GeneticAlgorithm(
+            problem, population, generations, "uniform", "tournament", "uniform",
+            representation=representation, logMode="summary", seed=0
+        )
+
+    ga = make()
+    started = time.perf_counter()
+    logs = ga.run()
+    seconds = time.perf_counter() - started
+    if seconds < 0.5:
+        # Lần chạy ngắn dao động nhiều: đo lặp lại và lấy lần tốt nhất
+        seconds = min(seconds, time_call(lambda: make().run(), min_time=0.2))
+    # Bộ nhớ đỉnh đo ở lần chạy thứ hai (cùng seed) để tracemalloc không làm sai thời gian
+    tracemalloc.start()
+    make().run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds"             : seconds,
+        "generations_per_sec" : logs.length / seconds,
+        "evaluations_per_sec" : ga.evaluations / seconds,
+        "peak_memory_mb"      : peak / 2 ** 20,
+    }
+
+
+def run_suite(item_counts, populations, generation_counts, verbose=True):
+    results = {}
+
+    def record(name, metrics):
+        results[name] = metrics
+        if verbose:
+            rate = next((f"{metrics[k]:12.1f} {k}" for k in ("generations_per_sec", "evaluations_per_sec") if k in metrics), "")
+            print(f"{name:58} {metrics['seconds'] * 1000:10.3f} ms {rate}", flush=True)
+
+    for n_items in item_counts:
+        problem = make_problem(n_items)
+        for population in populations:
+            prefix = f"n={n_items}/pop={population}"
+            for name, metrics in bench_fitness(problem, population).items():
+                record(f"{prefix}/{name}", metrics)
+            for name, metrics in bench_operators(problem, population).items():
+                record(f"{prefix}/{name}", metrics)
+            for generations in generation_counts:
+                for representation in ("array", "list"):
+                    if representation == "list" and n_items * population * generations > 2e7:
+                        continue  # biểu diễn list quá chậm ở kích thước lớn
+                    metrics = bench_run(problem, population, generations, representation)
+                    record(f"{prefix}/gen={generations}/run.{representation}", metrics)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    # Trả về danh sách (tên, thời gian baseline, thời gian hiện tại) chậm hơn baseline quá tolerance
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if reference and metrics["seconds"] > reference["seconds"] * (1 + tolerance):
+            regressions.append((name, reference["seconds"], metrics["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GA knapsack")
+    parser.add_argument("--quick", action="store_true", help="Ma trận nhỏ (chạy nhanh)")
+    parser.add_argument("-o", "--output", default=None, help="Ghi kết quả JSON ra file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Ghi kết quả hiện tại làm baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Chậm hơn baseline bao nhiêu (tỉ lệ) thì báo lỗi; các phép đo vi mô dao động khá mạnh")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        matrix = (QUICK["items"], QUICK["populations"], QUICK["generations"])
+    else:
+        matrix = (ITEM_COUNTS, POPULATION_SIZES, GENERATION_COUNTS)
+    report = {
+        "meta": {
+            "python"   : platform.python_version(),
+            "numpy"    : np.__version__,
+            "platform" : platform.platform(),
+            "machine"  : platform.machine(),
+        },
+        "results": run_suite(*matrix),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Đã ghi baseline vào {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Chưa có baseline ({args.baseline}), bỏ qua so sánh.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(report["results"], baseline, args.tolerance)
+    for name, before, after in regressions:
+        print(f"CHẬM {name:58} {before * 1000:10.3f} ms → {after * 1000:10.3f} ms (x{after / before:.2f})")
+    print(f"{len(regressions)} phép đo chậm hơn baseline quá {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Kiểm tra ngân sách thời gian import bằng `python -X importtime`.
+#   python benchmarks/import_time.py        (exit code 1 nếu vượt ngân sách)
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module: (ngân sách ms, các thư viện không được phép import kéo theo)
+# Ngân sách ~1.5–2 lần thời gian đo được (problem.* ~110 ms, utils.cli ~130 ms, giao diện ~25 ms)
+BUDGETS = {
+    "problem.knapsack" : (200, ("tkinter", "matplotlib", "pandas")),
+    "problem.genetic"  : (200, ("tkinter", "matplotlib", "pandas")),
+    "utils.cli"        : (250, ("tkinter", "matplotlib", "pandas")),
+    "utils.GUI"        : (50, ("numpy", "matplotlib", "pandas")),
+    "utils.AVG"        : (50, ("numpy", "matplotlib", "pandas")),
+    "utils.HIS"        : (50, ("numpy", "matplotlib", "pandas")),
+}
+# Mỗi module được đo REPEAT lần trong tiến trình mới, lấy lần nhanh nhất để giảm dao động
+REPEAT = 3
+
+
+def measure_import(module):
+    # Trả về (thời gian import tích luỹ tính bằng ms, tập các package gốc đã được import)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # dòng tiêu đề
+        imported.add(name.strip().split(".")[0])
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+def main():
+    failures = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        measurements = [measure_import(module) for _ in range(REPEAT)]
+        elapsed_ms = min(elapsed for elapsed, _ in measurements)
+        imported = set().union(*(names for _, names in measurements))
+        leaked = sorted(set(forbidden) & imported)
+        status = "OK"
+        if elapsed_ms > budget_ms or leaked:
+            status = "FAIL"
+            failures.append(module)
+        extra = f" (kéo theo: {', '.join(leaked)})" if leaked else ""
+        print(f"{status:4} {module:18} {elapsed_ms:8.1f} ms / {budget_ms} ms{extra}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
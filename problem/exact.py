@@ -0,0 +1,157 @@
+import sys
+from bisect import bisect_right
+import numpy as np
+from problem.knapsack import KnapsackProblem
+
+# Quy hoạch động tốn (số mảnh sau khi tách nhị phân) x (capacity + 1) ô;
+# vượt quá ngưỡng này thì coi như lời giải chính xác không còn "rẻ"
+MAX_DP_CELLS = 200_000_000
+
+
+def _result(problem, quantities, method, optimal):
+    quantities = np.asarray(quantities, dtype=np.int64)
+    return {
+        "value"      : float(quantities @ problem.values),
+        "weight"     : float(quantities @ problem.weights),
+        "individual" : quantities.tolist(),
+        "method"     : method,
+        "optimal"    : optimal
+    }
+
+
+def has_integer_weights(problem: KnapsackProblem):
+    return bool(np.all(problem.weights == np.round(problem.weights)) and np.all(problem.weights >= 0))
+
+
+def binary_split(problem: KnapsackProblem):
+    # Tách Max_quantity q thành các mảnh 1, 2, 4, ..., phần dư: mọi số lượng 0..q đều ghép được
+    # từ một tập con các mảnh, nên bài toán bị chặn trở thành 0/1 với O(sum log q) mảnh
+    pieces = []
+    for i, quantity in enumerate(problem.max_quantities.tolist()):
+        k = 1
+        while quantity > 0:
+            take = min(k, quantity)
+            pieces.append((i, take))
+            quantity -= take
+            k *= 2
+    return pieces
+
+
+def dp_cells(problem: KnapsackProblem):
+    return len(binary_split(problem)) * (int(max(problem.capacity, 0)) + 1)
+
+
+def solve_dp(problem: KnapsackProblem):
+    if not has_integer_weights(problem):
+        raise ValueError("Quy hoạch động chỉ áp dụng cho trọng lượng nguyên. Dùng solve_branch_and_bound.")
+    capacity = int(max(problem.capacity, 0))
+    weights = problem.weights.astype(np.int64)
+    values = problem.values
+
+    best = np.zeros(capacity + 1)   # best[c] = giá trị lớn nhất với trọng lượng <= c
+    quantities = np.zeros(len(problem.items), dtype=np.int64)
+    taken = []                      # bit "lấy mảnh này" theo từng mức trọng lượng (nén bằng packbits)
+    for i, take in binary_split(problem):
+        piece_weight, piece_value = weights[i] * take, values[i] * take
+        if piece_value <= 0:
+            continue
+        if piece_weight == 0:
+            quantities[i] += take   # vật phẩm không có trọng lượng: luôn lấy
+            best += piece_value
+            continue
+        if piece_weight > capacity:
+            continue
+        candidate = best[:capacity + 1 - piece_weight] + piece_value
+        improved = candidate > best[piece_weight:]
+        best[piece_weight:][improved] = candidate[improved]
+        mask = np.zeros(capacity + 1, dtype=bool)
+        mask[piece_weight:] = improved
+        taken.append((i, take, piece_weight, np.packbits(mask)))
+
+    # Truy vết ngược từ mức trọng lượng tối đa
+    c = capacity
+    for i, take, piece_weight, packed in reversed(taken):
+        if (packed[c >> 3] >> (7 - (c & 7))) & 1:
+            quantities[i] += take
+            c -= piece_weight
+    return _result(problem, quantities, "dp", True)
+
+
+def solve_branch_and_bound(problem: KnapsackProblem, node_limit=1_000_000):
+    # Nhánh cận với cận trên là nghiệm của bài toán nới lỏng liên tục (lấy phân số vật phẩm)
+    weights, values = problem.weights, problem.values
+    max_q = problem.max_quantities
+    capacity = float(problem.capacity)
+    quantities = np.zeros(len(problem.items), dtype=np.int64)
+
+    free = (weights <= 0) & (values > 0)
+    quantities[free] = max_q[free]
+    order = [i for i in np.argsort(-(values / np.where(weights > 0, weights, 1))).tolist()
+             if weights[i] > 0 and values[i] > 0 and max_q[i] > 0]
+    base_value = float(quantities @ values)
+
+    w = [float(weights[i]) for i in order]
+    v = [float(values[i]) for i in order]
+    q = [int(max_q[i]) for i in order]
+    prefix_w, prefix_v = [0.0], [0.0]
+    for wi, vi, qi in zip(w, v, q):
+        prefix_w.append(prefix_w[-1] + wi * qi)
+        prefix_v.append(prefix_v[-1] + vi * qi)
+
+    def upper_bound(k, remaining):
+        # Lấy trọn các vật phẩm từ k theo thứ tự tỉ lệ giảm dần, vật phẩm kế tiếp lấy phân số
+        j = bisect_right(prefix_w, prefix_w[k] + remaining + 1e-9) - 1
+        bound = prefix_v[j] - prefix_v[k]
+        if j < len(order):
+            bound += (remaining - (prefix_w[j] - prefix_w[k])) * v[j] / w[j]
+        return bound
+
+    best_value = -1.0
+    best_choice = [0] * len(order)
+    choice = [0] * len(order)
+    nodes = 0
+    complete = True
+
+    def search(k, remaining, value):
+        nonlocal best_value, best_choice, nodes, complete
+        if value > best_value:
+            best_value, best_choice = value, choice[:]
+        if k == len(order):
+            return
+        if value + upper_bound(k, remaining) <= best_value + 1e-9:
+            return
+        nodes += 1
+        if nodes > node_limit:
+            complete = False
+            return
+        most = min(q[k], int((remaining + 1e-9) // w[k]))
+        for t in range(most, -1, -1):
+            choice[k] = t
+            search(k + 1, remaining - t * w[k], value + t * v[k])
+            if not complete:
+                break
+        choice[k] = 0
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, len(order) + 100))
+    try:
+        search(0, capacity - float(quantities @ weights), base_value)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    for k, i in enumerate(order):
+        quantities[i] += best_choice[k]
+    return _result(problem, quantities, "branch_and_bound", complete)
+
+
+def solve_exact(problem: KnapsackProblem, max_dp_cells=MAX_DP_CELLS, node_limit=1_000_000):
+    if has_integer_weights(problem) and dp_cells(problem) <= max_dp_cells:
+        return solve_dp(problem)
+    return solve_branch_and_bound(problem, node_limit)
+
+
+def optimality_gap(fitness, optimum):
+    # Khoảng cách tương đối so với tối ưu: 0.0 = đạt tối ưu, 0.4 = chỉ đạt 60% tối ưu
+    if optimum <= 0:
+        return 0.0
+    return (optimum - fitness) / optimum
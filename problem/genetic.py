@@ -1,6 +1,17 @@
 from problem.knapsack import KnapsackProblem
-import random
-import copy
+from problem.logs import GenerationLog
+from problem.profiling import NO_PHASE, make_profiler
+import time
+from bisect import bisect_right
+import numpy as np
+
+
+def spawn_seeds(seed, count):
+    # Mỗi lần chạy / mỗi đảo nhận một seed độc lập sinh từ cùng một SeedSequence gốc
+    # (seed=None: entropy ngẫu nhiên từ hệ điều hành)
+    children = np.random.SeedSequence(seed).spawn(count)
+    return [int(child.generate_state(2, np.uint64)[0]) for child in children]
+
 
 class GeneticAlgorithm:
     def __init__(
@@ -12,8 +23,29 @@ class GeneticAlgorithm:
         selectionType, 
         mutationType,
         crossoverRate=0.8, 
-        mutationRate=0.05
+        mutationRate=0.05,
+        representation='list',
+        tournamentSize=3,
+        eliteCount=1,
+        logMode='full',
+        stagnationGenerations=None,
+        targetFitness=None,
+        timeLimit=None,
+        diversityThreshold=None,
+        initialization='random',
+        verifyDelta=False,
+        seed=None,
+        mutationSampling='mask',
+        profiler=None
     ):
+        if representation not in ('list', 'array'):
+            raise ValueError("Kiểu biểu diễn quần thể không hợp lệ. Chọn 'list' hoặc 'array'.")
+        if initialization not in ('random', 'feasible'):
+            raise ValueError("Cách khởi tạo không hợp lệ. Chọn 'random' hoặc 'feasible'.")
+        if logMode not in ('full', 'summary'):
+            raise ValueError("Chế độ log không hợp lệ. Chọn 'full' hoặc 'summary'.")
+        if mutationSampling not in ('mask', 'geometric'):
+            raise ValueError("Cách chọn gene đột biến không hợp lệ. Chọn 'mask' hoặc 'geometric'.")
         self.problem        = problem
         self.populationSize = populationSize
         self.generations    = generations
@@ -22,16 +54,76 @@ class GeneticAlgorithm:
         self.mutationType = mutationType
         self.selectionType = selectionType
         self.mutationRate   = mutationRate
+        # 'mask': một phép thử Bernoulli cho mỗi gene; 'geometric': nhảy thẳng tới gene đột biến kế tiếp
+        # theo khoảng cách phân phối hình học (chỉ tốn công cho ~ mutationRate * số gene vị trí)
+        self.mutationSampling = mutationSampling
+        self.representation = representation
+        self.tournamentSize = tournamentSize
+        self.eliteCount     = eliteCount
+        self.logMode        = logMode
+        self.initialization = initialization
+        self.verifyDelta    = verifyDelta  # debug: đối chiếu tổng cập nhật theo delta với đánh giá đầy đủ
+        # Đo thời gian / số lần gọi từng pha (None = tắt): True, 'phases', 'cprofile', 'tracemalloc' hoặc một Profiler
+        self.profiler       = make_profiler(profiler)
+        # Mỗi GA sở hữu một luồng số ngẫu nhiên riêng: cùng seed → cùng kết quả,
+        # không dùng chung trạng thái toàn cục của random / np.random giữa các luồng hay tiến trình
+        self.seed           = seed
+        self.rng            = np.random.default_rng(seed)
+        # Điều kiện dừng sớm (None = không dùng)
+        self.stagnationGenerations = stagnationGenerations  # số thế hệ liên tiếp best không cải thiện
+        self.targetFitness         = targetFitness          # đạt fitness mục tiêu
+        self.timeLimit             = timeLimit              # giới hạn thời gian chạy (giây)
+        self.diversityThreshold    = diversityThreshold     # độ đa dạng quần thể tối thiểu
         self.population     = []
-        self.logs           = []
+        self.fitnesses      = None   # fitness của thế hệ hiện tại, tính đúng một lần mỗi thế hệ
+        self.evaluations    = 0      # tổng số lần đánh giá fitness
+        self._cumulative_fitness = None  # bảng tích luỹ cho roulette, dựng lại mỗi thế hệ
+        self.logs           = None   # GenerationLog của lần chạy gần nhất
+        # representation='array': quần thể là view [:populationSize] của một bộ đệm (populationSize + 1) hàng,
+        # thế hệ kế tiếp được ghi vào bộ đệm thứ hai rồi hoán đổi. Dòng cuối là chỗ tạm cho con thừa khi số con lẻ.
+        self._buffer          = None
+        self._next_buffer     = None
+        # Mỗi cá thể mang sẵn (tổng trọng lượng, tổng giá trị), cập nhật theo delta
+        self.totals           = None
+        self._next_totals     = None
+        self._item_totals     = np.stack([problem.weights, problem.values], axis=1)  # (n_items x 2)
 
     def initial_population(self):
-        self.population = [
-            [random.randint(0, item['Max_quantity']) for item in self.problem.items]
-            for _ in range(self.populationSize)
-        ]
+        if self.representation == 'array':
+            n_items = len(self.problem.items)
+            self._buffer = np.empty((self.populationSize + 1, n_items), dtype=np.int32)
+            self._next_buffer = np.empty_like(self._buffer)
+            self.population = self._buffer[:self.populationSize]
+            self.population[:] = self.rng.integers(
+                0, self.problem.max_quantities + 1,
+                size=(self.populationSize, n_items), dtype=np.int32
+            )
+            self.totals = np.empty((self.populationSize + 1, 2))
+            self._next_totals = np.empty_like(self.totals)
+            self.totals[:self.populationSize] = self.population @ self._item_totals
+        else:
+            self.population = self.rng.integers(
+                0, self.problem.max_quantities + 1,
+                size=(self.populationSize, len(self.problem.items))
+            ).tolist()
+        # Khởi tạo thiên về khả thi: sửa ngay các cá thể vượt sức chứa từ đầu
+        if self.initialization == 'feasible':
+            self.repair_population(self.population)
+
+    def repair_population(self, population):
+        if self.representation == 'array':
+            # Tổng trọng lượng đã có sẵn: chỉ sửa và tính lại các hàng vượt sức chứa
+            rows = np.flatnonzero(self.totals[:len(population), 0] > self.problem.weight_limit)
+            if rows.size:
+                repaired = self.problem.repair_batch(population[rows])
+                population[rows] = repaired
+                self.totals[rows] = repaired @ self._item_totals
+            return population
+        self.population = self.problem.repair_batch(np.array(population, dtype=np.int64)).tolist()
+        return self.population
     
-    def selection(self, num_choices=3):
+    def selection(self, num_choices=None):
+        num_choices = num_choices or self.tournamentSize
         if self.selectionType == 'tournament':
             return self.tournament_selection(num_choices)
         elif self.selectionType == 'random':
@@ -42,34 +134,80 @@ class GeneticAlgorithm:
             raise ValueError("Phương pháp selection không hợp lệ. Chọn 'tournament', 'random' hoặc 'roulette'.")
 
     def evaluate_fitness(self, individual):
+        self.evaluations += 1
         return self.problem.fitness(individual)
 
+    def evaluate_population(self, population):
+        self.evaluations += len(population)
+        if self.representation == 'array':
+            totals = self.totals[:len(population)]
+            if self.verifyDelta:
+                expected = population @ self._item_totals
+                if not np.allclose(totals, expected):
+                    bad = np.flatnonzero(~np.isclose(totals, expected).all(axis=1))
+                    raise AssertionError(f"Tổng cập nhật theo delta sai lệch ở các cá thể {bad.tolist()}")
+            self.fitnesses = self.problem.fitness_from_totals(totals[:, 0], totals[:, 1])
+        else:
+            self.fitnesses = self.problem.fitness_batch(population)
+        self._cumulative_fitness = None
+        return self.fitnesses
+
+    def cumulative_fitness(self):
+        # Chỉ dựng bảng phân phối tích luỹ một lần cho mỗi thế hệ
+        if self._cumulative_fitness is None:
+            # Fitness có thể âm khi dùng hàm phạt: dịch cho giá trị nhỏ nhất về 0
+            self._cumulative_fitness = np.cumsum(self.fitnesses - min(0.0, self.fitnesses.min()))
+        return self._cumulative_fitness
+
+    def select_parent_indices(self, num_parents, num_choices=None):
+        # Chọn chỉ số của toàn bộ cha mẹ cho thế hệ kế tiếp trong một lần
+        num_choices = num_choices or self.tournamentSize
+        if self.selectionType == 'roulette':
+            return self.roulette_wheel_indices(num_parents)
+        elif self.selectionType == 'random':
+            return self.rng.integers(0, len(self.population), size=num_parents)
+        elif self.selectionType == 'tournament':
+            return self.tournament_indices(num_parents, num_choices)
+        else:
+            raise ValueError("Phương pháp selection không hợp lệ. Chọn 'tournament', 'random' hoặc 'roulette'.")
+
+    def tournament_index(self, num_choices=3):
+        candidates = self.rng.integers(0, len(self.population), size=num_choices)
+        return int(candidates[self.fitnesses[candidates].argmax()])
+
     def tournament_selection(self, num_choices=3):
-        candidates = random.choices(self.population, k=num_choices)
-        candidates.sort(key=self.evaluate_fitness, reverse=True)
-        return candidates[0]
+        return self.population[self.tournament_index(num_choices)]
+
+    def tournament_indices(self, num_parents, num_choices=3):
+        # Ma trận ứng viên (num_parents x num_choices), mỗi hàng lấy ứng viên có fitness cao nhất
+        candidates = self.rng.integers(0, len(self.population), size=(num_parents, num_choices))
+        winners = self.fitnesses[candidates].argmax(axis=1)
+        return candidates[np.arange(num_parents), winners]
 
     def random_selection(self):
-        return random.choice(self.population)
+        return self.population[self.rng.integers(len(self.population))]
 
     def roulette_wheel_selection(self):
-        fitness_values = [self.evaluate_fitness(ind) for ind in self.population]
-        total_fitness = sum(fitness_values)
+        cumulative = self.cumulative_fitness()
+        total_fitness = cumulative[-1]
 
         if total_fitness == 0:
-            return random.choice(self.population)
+            return self.population[self.rng.integers(len(self.population))]
+
+        # Tìm nhị phân trên bảng tích luỹ: O(log n) mỗi lần chọn
+        i = bisect_right(cumulative, self.rng.random() * total_fitness)
+        return self.population[min(i, len(cumulative) - 1)]
 
-        probabilities = [f / total_fitness for f in fitness_values]
-        cumulative_probabilities = []
-        cumulative = 0
-        for p in probabilities:
-            cumulative += p
-            cumulative_probabilities.append(cumulative)
+    def roulette_wheel_indices(self, num_parents):
+        cumulative = self.cumulative_fitness()
+        total_fitness = cumulative[-1]
 
-        r = random.random()
-        for i, cumulative_p in enumerate(cumulative_probabilities):
-            if r <= cumulative_p:
-                return self.population[i]
+        if total_fitness == 0:
+            return self.rng.integers(0, len(cumulative), size=num_parents)
+
+        draws = self.rng.random(num_parents) * total_fitness
+        indices = np.searchsorted(cumulative, draws, side='right')
+        return np.minimum(indices, len(cumulative) - 1)
 
     def crossover(self, parent1, parent2):
         if self.crossoverType == 'uniform':
@@ -79,43 +217,82 @@ class GeneticAlgorithm:
         elif self.crossoverType == 'two_points':
             return self.two_points_crossover(parent1, parent2)
         else:
-            return parent1, parent2
+            return parent1[:], parent2[:]
 
     def one_point_crossover(self, parent1, parent2):
         if len(self.problem.items) < 2:
         # Không thể cắt nếu có ít hơn 2 gene → giữ nguyên
             return parent1[:], parent2[:]
-        if random.random() < self.crossoverRate:
-            cut_point = random.randint(1, len(self.problem.items) - 1)
+        if self.rng.random() < self.crossoverRate:
+            cut_point = int(self.rng.integers(1, len(self.problem.items)))
             return (
                 parent1[:cut_point] + parent2[cut_point:],
                 parent2[:cut_point] + parent1[cut_point:]
             )
-        return parent1, parent2
+        return parent1[:], parent2[:]
 
     def two_points_crossover(self, parent1, parent2):
-        if random.random() < self.crossoverRate:
-            point1 = random.randint(1, len(parent1) - 2)
-            point2 = random.randint(point1 + 1, len(parent1) - 1)
+        if self.rng.random() < self.crossoverRate:
+            point1 = int(self.rng.integers(1, len(parent1) - 1))
+            point2 = int(self.rng.integers(point1 + 1, len(parent1)))
             child1 = parent1[:point1] + parent2[point1:point2] + parent1[point2:]
             child2 = parent2[:point1] + parent1[point1:point2] + parent2[point2:]
             return child1, child2
-        return parent1, parent2
+        return parent1[:], parent2[:]
 
     def uniform_crossover(self, parent1, parent2):
-        if random.random() > self.crossoverRate:
-            return parent1, parent2  # không crossover thì giữ nguyên
+        if self.rng.random() > self.crossoverRate:
+            return parent1[:], parent2[:]  # không crossover thì giữ nguyên (bản sao, tránh sửa cá thể cha)
             
-        child1, child2 = [], []
-        for gene1, gene2 in zip(parent1, parent2):
-            if random.random() < 0.5:  # swap probability
-                child1.append(gene2)
-                child2.append(gene1)
-            else:
-                child1.append(gene1)
-                child2.append(gene2)
+        # Rút một lần toàn bộ mặt nạ hoán đổi thay vì gọi random cho từng gene
+        swap = (self.rng.random(len(parent1)) < 0.5).tolist()  # swap probability
+        child1 = [g2 if s else g1 for g1, g2, s in zip(parent1, parent2, swap)]
+        child2 = [g1 if s else g2 for g1, g2, s in zip(parent1, parent2, swap)]
         return child1, child2
 
+    # Lai tạo theo lô cho representation='array': sinh mặt nạ hoán đổi (num_pairs x n_items) cho cả
+    # quần thể giao phối trong một lần, giữ nguyên ngữ nghĩa của các toán tử từng cặp ở trên
+    # (kể cả xác suất bỏ qua crossoverRate). Hàng của cặp không lai tạo toàn False.
+    def crossover_mask(self, num_pairs, n_genes):
+        if self.crossoverType == 'uniform':
+            return self.uniform_crossover_mask(num_pairs, n_genes)
+        elif self.crossoverType == 'one_point':
+            return self.one_point_crossover_mask(num_pairs, n_genes)
+        elif self.crossoverType == 'two_points':
+            return self.two_points_crossover_mask(num_pairs, n_genes)
+        return None
+
+    def one_point_crossover_mask(self, num_pairs, n_genes):
+        if n_genes < 2:
+            return None
+        crossed = self.rng.random(num_pairs) < self.crossoverRate
+        cut_points = self.rng.integers(1, n_genes, size=num_pairs)
+        return (np.arange(n_genes) >= cut_points[:, None]) & crossed[:, None]
+
+    def two_points_crossover_mask(self, num_pairs, n_genes):
+        crossed = self.rng.random(num_pairs) < self.crossoverRate
+        point1 = self.rng.integers(1, n_genes - 1, size=num_pairs)
+        point2 = self.rng.integers(point1 + 1, n_genes)
+        genes = np.arange(n_genes)
+        return (genes >= point1[:, None]) & (genes < point2[:, None]) & crossed[:, None]
+
+    def uniform_crossover_mask(self, num_pairs, n_genes):
+        crossed = ~(self.rng.random(num_pairs) > self.crossoverRate)
+        return (self.rng.random((num_pairs, n_genes)) < 0.5) & crossed[:, None]
+
+    def crossover_batch(self, parents1, parents2, children1, children2):
+        # Ghi con vào children1/children2 (view của bộ đệm thế hệ mới) và trả về delta tổng
+        # (num_pairs x 2): tổng(con1) = tổng(cha1) + d, tổng(con2) = tổng(cha2) - d
+        np.take(self.population, parents1, axis=0, out=children1)
+        np.take(self.population, parents2, axis=0, out=children2)
+        swap = self.crossover_mask(len(parents1), children1.shape[1])
+        if swap is None:
+            return np.zeros((len(parents1), 2))
+        diff = (children2 - children1) * swap
+        children1 += diff
+        children2 -= diff
+        return diff @ self._item_totals
+
     def mutate(self, individual):
         if self.mutationType == 'uniform':
             return self.uniform_mutate(individual)
@@ -124,62 +301,257 @@ class GeneticAlgorithm:
         else:
             return individual
 
+    def mutation_positions(self, size):
+        # Vị trí (đã sắp tăng dần) của các gene bị đột biến trong size gene, mỗi gene độc lập với xác suất mutationRate
+        if self.mutationSampling == 'mask' or size == 0:
+            return np.flatnonzero(self.rng.random(size) < self.mutationRate)
+        if self.mutationRate <= 0:
+            return np.empty(0, dtype=np.int64)
+        if self.mutationRate >= 1:
+            return np.arange(size)
+        # Khoảng cách giữa hai gene đột biến liên tiếp ~ Geometric(mutationRate); rút theo lô,
+        # lô đầu đủ lớn để hầu như luôn vượt quá size
+        expected = size * self.mutationRate
+        batch = int(expected + 4 * np.sqrt(expected)) + 8
+        chunks, last = [], -1
+        while True:
+            positions = last + np.cumsum(self.rng.geometric(self.mutationRate, size=batch))
+            if positions[-1] >= size:
+                chunks.append(positions[:np.searchsorted(positions, size)])
+                break
+            chunks.append(positions)
+            last = positions[-1]
+        return np.concatenate(chunks)
+
     def uniform_mutate(self, individual):
-        for i in range(len(individual)):
-            if random.random() < self.mutationRate:
-                individual[i] = random.randint(0, self.problem.items[i]['Max_quantity'])
+        mutated = self.mutation_positions(len(individual))
+        if mutated.size:
+            values = self.rng.integers(0, self.problem.max_quantities[mutated] + 1)
+            for i, value in zip(mutated.tolist(), values.tolist()):
+                individual[i] = value
         return individual
 
     def scramble_mutate(self, individual):
-        if random.random() < self.mutationRate:
-            start = random.randint(0, len(individual) - 2)
-            end = random.randint(start + 1, len(individual) - 1)
+        if self.rng.random() < self.mutationRate:
+            start = int(self.rng.integers(0, len(individual) - 1))
+            end = int(self.rng.integers(start + 1, len(individual)))
             segment = individual[start:end + 1]
-            random.shuffle(segment)
+            self.rng.shuffle(segment)
             individual[start:end + 1] = segment
         return individual
 
-    def run(self, log_callback=None):
-        self.initial_population()
+    # Đột biến theo lô trên toàn bộ ma trận con (representation='array'), ghi trực tiếp vào bộ đệm;
+    # trả về delta (số con x 2) chỉ tính trên các gene bị đổi: tổng(con) += d
+    def mutate_batch(self, children):
+        if self.mutationType == 'uniform':
+            return self.uniform_mutate_batch(children)
+        elif self.mutationType == 'scramble':
+            return self.scramble_mutate_batch(children)
+        return 0.0
+
+    def uniform_mutate_batch(self, children):
+        num_children, n_genes = children.shape
+        positions = self.mutation_positions(children.size)
+        if positions.size == 0:
+            return 0.0
+        rows, genes = np.divmod(positions, n_genes)
+        old = children[rows, genes]
+        new = self.rng.integers(0, self.problem.max_quantities[genes] + 1)
+        children[rows, genes] = new
+        change = (new - old)[:, None] * self._item_totals[genes]
+        delta = np.zeros((num_children, 2))
+        np.add.at(delta, rows, change)
+        return delta
+
+    def scramble_mutate_batch(self, children):
+        num_children, n_genes = children.shape
+        rows = np.flatnonzero(self.rng.random(num_children) < self.mutationRate)
+        if rows.size == 0:
+            return 0.0
+        start = self.rng.integers(0, n_genes - 1, size=rows.size)[:, None]
+        end = self.rng.integers(start[:, 0] + 1, n_genes)[:, None]
+        # Xáo trộn đoạn [start, end] của mọi hàng được chọn trong một lần argsort: gene ngoài đoạn giữ
+        # khoá bằng chính vị trí, gene trong đoạn nhận khoá ngẫu nhiên trong [start, end + 1)
+        genes = np.arange(n_genes)
+        inside = (genes >= start) & (genes <= end)
+        keys = np.where(inside, start + self.rng.random((rows.size, n_genes)) * (end - start + 1), genes)
+        old = children[rows]
+        new = np.take_along_axis(old, np.argsort(keys, axis=1), axis=1)
+        children[rows] = new
+        delta = np.zeros((num_children, 2))
+        delta[rows] = (new - old) @ self._item_totals
+        return delta
+
+    def elite_indices(self):
+        # Chỉ số top-k cá thể theo fitness đã cache (không sắp xếp toàn bộ quần thể)
+        k = max(0, min(self.eliteCount, len(self.fitnesses)))
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+        if k == len(self.fitnesses):
+            return np.arange(k)
+        return np.argpartition(-self.fitnesses, k - 1)[:k]
+
+    def next_generation_list(self, elites):
         population = self.population
+        num_children = self.populationSize - len(elites)
+        with self.phase('selection'):
+            parents = self.select_parent_indices(2 * ((num_children + 1) // 2))
 
-        for generation in range(self.generations):
-            fitnesses = [self.evaluate_fitness(ind) for ind in population]
-            best_fitness     = max(fitnesses)
-            avg_fitness      = sum(fitnesses) / len(fitnesses)
-            worst_fitness    = min(fitnesses)
-            best_individual = copy.deepcopy(max(population, key=self.evaluate_fitness))
-
-            log = {
-                "generation"     : generation + 1,
-                "best"           : best_fitness,
-                "avg"            : avg_fitness,
-                "worst"          : worst_fitness,
-                "bestIndividual" : best_individual
-            }
-            self.logs.append(log)
-
-            if log_callback and (generation + 1) % 10 == 0: #callback này giống như 1 cách để gọi cập nhật biểu đồ song song với chạy thuật toán 
-                log_callback(log)
-
-            new_population = []
-            while len(new_population) < self.populationSize:
-                parent1 = self.selection()
-                parent2 = self.selection()
+        new_population = []
+        # Giữ thứ tự lai tạo rồi đột biến từng cặp (thứ tự rút số ngẫu nhiên không đổi theo seed);
+        # thời gian mỗi lần gọi được cộng dồn vào pha tương ứng
+        crossover_phase, mutation_phase = self.phase('crossover'), self.phase('mutation')
+        for i in range(0, len(parents), 2):
+            parent1 = population[parents[i]]
+            parent2 = population[parents[i + 1]]
+            with crossover_phase:
                 child1, child2 = self.crossover(parent1, parent2)
+            with mutation_phase:
                 self.mutate(child1)
                 self.mutate(child2)
-                new_population.extend([child1, child2])
+            new_population.extend([child1, child2])
+
+        # Chừa chỗ cho các cá thể ưu tú (elitism)
+        new_population = new_population[:num_children]
+
+        # Thêm các cá thể tốt nhất trở lại quần thể (chỉ cần sao chép nông list số nguyên)
+        with self.phase('elitism'):
+            self.population = new_population + [population[i][:] for i in elites]
+        return self.population
+
+    def next_generation_array(self, elites):
+        # Lai tạo/đột biến ghi thẳng vào bộ đệm cấp phát sẵn, sau đó hoán đổi hai bộ đệm.
+        # Con thứ nhất của các cặp nằm ở [0, num_pairs), con thứ hai ở [num_pairs, 2 * num_pairs);
+        # nếu số con lẻ thì con thừa rơi vào ô elite đầu tiên (bị ghi đè) hoặc dòng tạm cuối bộ đệm.
+        population, totals = self.population, self.totals
+        buffer, next_totals = self._next_buffer, self._next_totals
+        num_children = self.populationSize - len(elites)
+        num_pairs = (num_children + 1) // 2
+        with self.phase('selection'):
+            parents = self.select_parent_indices(2 * num_pairs)
+        parents1, parents2 = parents[0::2], parents[1::2]
 
-            # Giữ lại best cá thể để elitism
-            new_population = new_population[:self.populationSize - 1]
+        with self.phase('crossover'):
+            delta = self.crossover_batch(parents1, parents2, buffer[:num_pairs], buffer[num_pairs:2 * num_pairs])
+            next_totals[:num_pairs] = totals[parents1] + delta
+            next_totals[num_pairs:2 * num_pairs] = totals[parents2] - delta
+        with self.phase('mutation'):
+            next_totals[:2 * num_pairs] += self.mutate_batch(buffer[:2 * num_pairs])
 
-            # Thêm cá thể tốt nhất trở lại quần thể
-            self.population = new_population + [best_individual]
-            population = self.population  # Cập nhật lại population cho thế hệ sau
+        # Các ô cuối của quần thể dành cho cá thể ưu tú (elitism)
+        with self.phase('elitism'):
+            np.take(population, elites, axis=0, out=buffer[num_children:self.populationSize])
+            next_totals[num_children:self.populationSize] = totals[elites]
+        self._buffer, self._next_buffer = buffer, self._buffer
+        self.totals, self._next_totals = next_totals, totals
+        self.population = buffer[:self.populationSize]
+        return self.population
 
-            # new_population = new_population[:self.populationSize]
-            # self.population = new_population
-            # population = self.population  
+    def population_diversity(self, population):
+        # Độ lệch chuẩn trung bình của mỗi gene, chuẩn hoá theo Max_quantity (0 = quần thể đồng nhất)
+        spread = np.asarray(population).std(axis=0) / np.maximum(self.problem.max_quantities, 1)
+        return float(spread.mean()) if spread.size else 0.0
 
-        return self.logs
\ No newline at end of file
+    def check_stop(self, generation, population, start_time):
+        if self.targetFitness is not None and self.logs.best_fitness >= self.targetFitness:
+            return 'target'
+        if self.stagnationGenerations is not None and generation - self.logs.best_generation >= self.stagnationGenerations:
+            return 'stagnation'
+        if self.timeLimit is not None and time.perf_counter() - start_time >= self.timeLimit:
+            return 'time'
+        if self.diversityThreshold is not None and self.population_diversity(population) <= self.diversityThreshold:
+            return 'diversity'
+        return None
+
+    # Di cư giữa các quần thể (mô hình đảo): gửi đi bản sao top-k, nhận về thay cho k cá thể kém nhất
+    def emigrants(self, count):
+        order = np.argsort(-self.fitnesses, kind='stable')[:count]
+        individuals = np.array([self.population[i] for i in order], dtype=np.int64).reshape(len(order), -1)
+        return individuals, self.fitnesses[order].copy()
+
+    def immigrate(self, individuals, fitnesses):
+        count = min(len(individuals), len(self.fitnesses))
+        if count == 0:
+            return
+        worst = np.argsort(self.fitnesses, kind='stable')[:count]
+        individuals, fitnesses = individuals[:count], fitnesses[:count]
+        if self.representation == 'array':
+            self.population[worst] = individuals
+            self.totals[worst] = individuals @ self._item_totals
+        else:
+            for i, individual in zip(worst.tolist(), individuals.tolist()):
+                self.population[i] = individual
+        self.fitnesses[worst] = fitnesses
+        self._cumulative_fitness = None
+
+    def phase(self, name):
+        return self.profiler.phase(name) if self.profiler else NO_PHASE
+
+    # Các bước của một lần chạy, tách riêng để có thể điều khiển từng thế hệ từ bên ngoài (vd. mô hình đảo)
+    def start(self):
+        self.start_time = time.perf_counter()
+        if self.profiler:
+            self.profiler.start_run()
+        with self.phase('initialization'):
+            self.initial_population()
+        self.logs = GenerationLog(self.generations, summary_only=self.logMode == 'summary')
+
+    def finish(self):
+        # Kết thúc lần chạy: dừng profiler và gắn báo cáo vào log
+        if self.profiler:
+            self.profiler.stop_run()
+            self.logs.profile = self.profiler.report()
+        return self.logs
+
+    def evaluate_generation(self, generation):
+        evaluations = self.evaluations
+        with self.phase('evaluation'):
+            population = self.population
+            if self.problem.constraint_handling == 'repair':
+                population = self.repair_population(population)
+            fitnesses = self.evaluate_population(population)
+        if self.profiler:
+            self.profiler.record_generation(self.evaluations - evaluations)
+        best_index = int(fitnesses.argmax())
+
+        # Chỉ chụp lại cá thể tốt nhất khi best được cải thiện
+        return self.logs.record(
+            generation, float(fitnesses.max()), float(fitnesses.mean()), float(fitnesses.min()),
+            self.evaluations, population[best_index]
+        )
+
+    def next_generation(self):
+        elites = self.elite_indices()
+        if self.representation == 'array':
+            return self.next_generation_array(elites)
+        return self.next_generation_list(elites)
+
+    def run_iter(self, stride=1):
+        # Sinh thống kê của từng thế hệ ngay khi tính xong (mỗi stride thế hệ, luôn gồm thế hệ cuối cùng).
+        # GA chỉ chạy tiếp khi bên gọi lấy phần tử kế tiếp (back-pressure tự nhiên); đóng generator
+        # (break / close()) thì dừng sớm với stop_reason='cancelled'. Log đầy đủ nằm ở self.logs / StopIteration.value.
+        stride = max(1, int(stride))
+        self.start()
+        try:
+            for generation in range(1, self.generations + 1):
+                log = self.evaluate_generation(generation)
+                stop_reason = self.check_stop(generation, self.population, self.start_time)
+                if generation % stride == 0 or stop_reason or generation == self.generations:
+                    yield dict(log)
+                if stop_reason:
+                    self.logs.stop_reason = stop_reason
+                    break
+                if generation < self.generations:
+                    # Cập nhật lại population cho thế hệ sau
+                    self.next_generation()
+        except GeneratorExit:
+            self.logs.stop_reason = 'cancelled'
+            self.finish()
+            raise
+        return self.finish()
+
+    def run(self, log_callback=None):
+        for log in self.run_iter(stride=10 if log_callback else self.generations):
+            if log_callback and log["generation"] % 10 == 0: #callback này giống như 1 cách để gọi cập nhật biểu đồ song song với chạy thuật toán 
+                log_callback(dict(log, bestIndividual=self.logs.best_individual))
+        return self.logs
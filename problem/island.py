@@ -0,0 +1,123 @@
+import random
+import multiprocessing
+import numpy as np
+from problem.genetic import GeneticAlgorithm, spawn_seeds
+from problem.knapsack import KnapsackProblem
+
+TOPOLOGIES = ('ring', 'fully_connected', 'random')
+
+
+def _island_worker(conn, problem, ga_params, seed, migration_interval, migration_size):
+    # Mỗi đảo là một GA độc lập trong tiến trình riêng; cứ migration_interval thế hệ
+    # thì gửi cá thể tốt nhất về tiến trình chính và nhận cá thể di cư từ đảo khác qua pipe
+    ga = GeneticAlgorithm(problem, seed=seed, **ga_params)
+    ga.start()
+    try:
+        for generation in range(1, ga.generations + 1):
+            ga.evaluate_generation(generation)
+            if generation == ga.generations:
+                break
+            if generation % migration_interval == 0:
+                stop_reason = ga.check_stop(generation, ga.population, ga.start_time)
+                conn.send((ga.emigrants(migration_size), stop_reason))
+                message = conn.recv()
+                if message is None:
+                    ga.logs.stop_reason = stop_reason or 'island'
+                    break
+                ga.immigrate(*message)
+            ga.next_generation()
+        conn.send(('done', ga.finish()))
+    finally:
+        conn.close()
+
+
+class IslandModel:
+    def __init__(
+        self,
+        problem: KnapsackProblem,
+        islands=4,
+        migrationInterval=10,
+        migrationRate=0.05,
+        topology='ring',
+        seed=None,
+        **ga_params
+    ):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Topology không hợp lệ. Chọn một trong {TOPOLOGIES}.")
+        self.problem           = problem
+        self.islands           = islands
+        self.migrationInterval = max(1, migrationInterval)
+        self.migrationRate     = migrationRate    # tỉ lệ quần thể di cư mỗi lần
+        self.topology          = topology
+        self.seed              = seed
+        self.ga_params         = ga_params        # tham số GeneticAlgorithm cho mỗi đảo
+        self.logs              = []
+        self.best_fitness      = None
+        self.best_individual   = None
+
+    def migration_size(self):
+        return max(1, int(round(self.migrationRate * self.ga_params['populationSize'])))
+
+    def route(self, emigrants, rng):
+        # Trả về danh sách (cá thể, fitness) di cư đến từng đảo theo topology
+        n = len(emigrants)
+        if self.topology == 'ring':
+            return [emigrants[(i - 1) % n] for i in range(n)]
+        if self.topology == 'random':
+            sources = [rng.choice([j for j in range(n) if j != i]) if n > 1 else i for i in range(n)]
+            return [emigrants[j] for j in sources]
+        # fully_connected: nhận những cá thể tốt nhất trong số các đảo còn lại
+        routed = []
+        for i in range(n):
+            others = [emigrants[j] for j in range(n) if j != i] or [emigrants[i]]
+            individuals = np.concatenate([ind for ind, _ in others])
+            fitnesses = np.concatenate([fit for _, fit in others])
+            best = np.argsort(-fitnesses, kind='stable')[:self.migration_size()]
+            routed.append((individuals[best], fitnesses[best]))
+        return routed
+
+    def run(self):
+        ctx = multiprocessing.get_context()
+        seeds = spawn_seeds(self.seed, self.islands + 1)
+        rng = random.Random(seeds[-1])
+        connections, processes = [], []
+        for island in range(self.islands):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_island_worker,
+                args=(child_conn, self.problem, self.ga_params, seeds[island],
+                      self.migrationInterval, self.migration_size()),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            connections.append(parent_conn)
+            processes.append(process)
+
+        try:
+            logs = [None] * self.islands
+            active = list(range(self.islands))
+            while active:
+                messages = {i: connections[i].recv() for i in active}
+                finished = [i for i, m in messages.items() if m[0] == 'done']
+                for i in finished:
+                    logs[i] = messages[i][1]
+                migrating = [i for i in active if i not in finished]
+                if migrating:
+                    reasons = [messages[i][1] for i in migrating]
+                    # Dừng tất cả khi một đảo đạt mục tiêu / hết giờ, hoặc khi mọi đảo đều muốn dừng
+                    stop = any(r in ('target', 'time') for r in reasons) or all(reasons)
+                    routed = self.route([messages[i][0] for i in migrating], rng)
+                    for i, immigrants in zip(migrating, routed):
+                        connections[i].send(None if stop else immigrants)
+                active = migrating
+        finally:
+            for conn in connections:
+                conn.close()
+            for process in processes:
+                process.join()
+
+        self.logs = logs
+        best = max(logs, key=lambda log: log.best_fitness)
+        self.best_fitness, self.best_individual = best.best_fitness, best.best_individual
+        return self.logs
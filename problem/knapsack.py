@@ -1,7 +1,45 @@
+import numpy as np
+
+# Cách xử lý cá thể vượt sức chứa:
+#   'zero'              : fitness = 0 (như ban đầu)
+#   'repair'            : GA sửa cá thể bằng tham lam theo tỉ lệ value/weight trước khi đánh giá
+#   'linear_penalty'    : value - hệ số * phần vượt
+#   'quadratic_penalty' : value - hệ số * phần vượt^2
+CONSTRAINT_HANDLING = ('zero', 'repair', 'linear_penalty', 'quadratic_penalty')
+# Sai số tương đối cho phép khi so tổng trọng lượng với sức chứa: với trọng lượng thập phân,
+# các cách cộng khác nhau (vòng lặp, ma trận) lệch nhau cỡ 1e-16, không được làm cá thể hợp lệ thành 0 điểm
+CAPACITY_TOLERANCE = 1e-9
+
+
 class KnapsackProblem:
-    def __init__(self, items, capacity):
+    def __init__(self, items, capacity, constraint_handling='zero', penalty_factor=None):
+        if constraint_handling not in CONSTRAINT_HANDLING:
+            raise ValueError(f"Cách xử lý ràng buộc không hợp lệ. Chọn một trong {CONSTRAINT_HANDLING}.")
         self.items = items
         self.capacity = capacity
+        self.constraint_handling = constraint_handling
+        # Tính sẵn vector trọng lượng / giá trị một lần để chấm điểm cả quần thể
+        self.weights = np.array([item['weight'] for item in items], dtype=float)
+        self.values = np.array([item['value'] for item in items], dtype=float)
+        self.max_quantities = np.array([item['Max_quantity'] for item in items], dtype=np.int64)
+
+        ratios = self.values / np.where(self.weights > 0, self.weights, 1)
+        # Hệ số phạt mặc định: tỉ lệ value/weight lớn nhất, để phần vượt không bao giờ "có lời"
+        if penalty_factor is None:
+            penalty_factor = float(ratios[self.weights > 0].max()) if np.any(self.weights > 0) else 1.0
+        self.penalty_factor = penalty_factor
+        # Thứ tự bỏ bớt vật phẩm khi sửa: tỉ lệ value/weight tăng dần (chỉ vật phẩm có trọng lượng)
+        self._repair_order = np.array([i for i in np.argsort(ratios, kind='stable') if self.weights[i] > 0], dtype=np.intp)
+
+    @property
+    def weight_limit(self):
+        # Tổng trọng lượng tối đa được coi là không vượt sức chứa
+        return self.capacity + CAPACITY_TOLERANCE * max(1.0, abs(self.capacity))
+
+    def penalty(self, excess):
+        if self.constraint_handling == 'linear_penalty':
+            return self.penalty_factor * excess
+        return self.penalty_factor * excess ** 2
 
     def fitness(self, individual):
         total_weight = 0
@@ -10,10 +48,47 @@ class KnapsackProblem:
         for quantity, item in zip(individual, self.items):
             total_weight += quantity*item['weight']
             total_value += quantity*item['value']
-        if total_weight > self.capacity:
+        if total_weight > self.weight_limit:
+            if self.constraint_handling in ('linear_penalty', 'quadratic_penalty'):
+                return total_value - self.penalty(total_weight - self.capacity)
             return 0
         return total_value         
-      
 
-     
+    def fitness_batch(self, population_matrix):
+        # population_matrix: ma trận (pop_size x n_items) số lượng mỗi vật phẩm
+        population_matrix = np.asarray(population_matrix).reshape(-1, len(self.items))
+        return self.fitness_from_totals(population_matrix @ self.weights, population_matrix @ self.values)
+
+    def fitness_from_totals(self, total_weights, total_values):
+        # Fitness chỉ phụ thuộc tổng trọng lượng / tổng giá trị của mỗi cá thể
+        if self.constraint_handling in ('linear_penalty', 'quadratic_penalty'):
+            excess = np.maximum(total_weights - self.capacity, 0.0)
+            return total_values - self.penalty(excess)
+        return np.where(total_weights <= self.weight_limit, total_values, 0.0)
 
+    def repair_batch(self, population_matrix):
+        # Sửa tại chỗ các hàng vượt sức chứa: bỏ bớt vật phẩm có tỉ lệ value/weight thấp nhất trước,
+        # chỉ bỏ đúng số lượng cần thiết ở vật phẩm cuối cùng. Toàn bộ được vector hoá theo hàng.
+        excess = population_matrix @ self.weights - self.capacity
+        rows = np.flatnonzero(excess > self.weight_limit - self.capacity)
+        if rows.size == 0:
+            return population_matrix
+        order = self._repair_order
+        weights = self.weights[order]
+        genes = population_matrix[np.ix_(rows, order)]
+        removed_after = np.cumsum(genes * weights, axis=1)
+        removed_before = removed_after - genes * weights
+        needed = np.ceil((excess[rows, None] - removed_before) / weights)
+        remove = np.clip(needed, 0, genes).astype(genes.dtype)
+        population_matrix[np.ix_(rows, order)] = genes - remove
+        # Với trọng lượng thập phân, sai số làm tròn của phép chia có thể khiến bỏ thiếu một đơn vị
+        # (vẫn vượt cỡ 1e-16): bỏ thêm từng đơn vị ở vật phẩm còn lại đầu tiên theo thứ tự sửa cho tới khi hợp lệ.
+        # Kiểm tra bằng đúng phép tính của fitness_batch.
+        over = rows[population_matrix[rows] @ self.weights > self.capacity]
+        while over.size:
+            remaining = population_matrix[np.ix_(over, order)] > 0
+            over = over[remaining.any(axis=1)]
+            first = order[np.argmax(remaining[remaining.any(axis=1)], axis=1)]
+            population_matrix[over, first] -= 1
+            over = over[population_matrix[over] @ self.weights > self.capacity]
+        return population_matrix
@@ -0,0 +1,106 @@
+from bisect import bisect_right
+import numpy as np
+
+
+class GenerationLog:
+    # Log theo cột: mảng float cấp phát sẵn cho best/avg/worst của từng thế hệ,
+    # cá thể tốt nhất chỉ được chụp lại (snapshot) khi best được cải thiện.
+    # summary_only=True chỉ giữ thống kê tổng hợp: bộ nhớ O(1) theo số thế hệ.
+    def __init__(self, generations, summary_only=False):
+        size = 0 if summary_only else generations
+        self.summary_only     = summary_only
+        self.length           = 0
+        self._best            = np.empty(size)
+        self._avg             = np.empty(size)
+        self._worst           = np.empty(size)
+        self._evaluations     = np.empty(size, dtype=np.int64)
+        self.snapshots        = []      # [(generation, individual)] mỗi khi best tăng
+        self.best_fitness     = float('-inf')
+        self.best_generation  = 0
+        self.best_individual  = None
+        self.last             = None    # thống kê của thế hệ gần nhất
+        self.stop_reason      = 'generations'  # hoặc 'target', 'stagnation', 'time', 'diversity'
+        self.profile          = None    # báo cáo của profiler (GeneticAlgorithm(profiler=...)), None nếu tắt
+
+    def record(self, generation, best, avg, worst, evaluations, best_individual):
+        # best_individual có thể là view vào quần thể: chỉ sao chép khi best cải thiện
+        if best > self.best_fitness:
+            self.best_fitness = best
+            self.best_generation = generation
+            self.best_individual = best_individual.copy()
+            if not self.summary_only:
+                self.snapshots.append((generation, self.best_individual))
+
+        if not self.summary_only:
+            i = self.length
+            self._best[i], self._avg[i], self._worst[i] = best, avg, worst
+            self._evaluations[i] = evaluations
+        self.length += 1
+        self.last = {
+            "generation"  : generation,
+            "best"        : best,
+            "avg"         : avg,
+            "worst"       : worst,
+            "evaluations" : evaluations
+        }
+        return self.last
+
+    @property
+    def best(self):
+        return self._best[:self.length]
+
+    @property
+    def avg(self):
+        return self._avg[:self.length]
+
+    @property
+    def worst(self):
+        return self._worst[:self.length]
+
+    @property
+    def evaluations(self):
+        return self._evaluations[:self.length]
+
+    def individual_at(self, generation):
+        # Cá thể tốt nhất tính đến thế hệ generation (snapshot gần nhất trước đó)
+        index = bisect_right([g for g, _ in self.snapshots], generation) - 1
+        return self.snapshots[index][1] if index >= 0 else None
+
+    def summary(self):
+        return {
+            "best"           : self.best_fitness,
+            "generation"     : self.best_generation,
+            "bestIndividual" : self.best_individual,
+            "generations"    : self.length,
+            "stopReason"     : self.stop_reason,
+            "profile"        : self.profile
+        }
+
+    # Giữ tương thích với kiểu log cũ (list các dict theo từng thế hệ)
+    def __len__(self):
+        return 0 if self.summary_only else self.length
+
+    def __bool__(self):
+        # Log summary_only có __len__ = 0 nhưng vẫn là một lần chạy đã có kết quả
+        return self.length > 0
+
+    def __getitem__(self, index):
+        if self.summary_only:
+            raise IndexError("GenerationLog ở chế độ summary_only không lưu log từng thế hệ")
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        generation = index + 1
+        return {
+            "generation"     : generation,
+            "best"           : float(self._best[index]),
+            "avg"            : float(self._avg[index]),
+            "worst"          : float(self._worst[index]),
+            "evaluations"    : int(self._evaluations[index]),
+            "bestIndividual" : self.individual_at(generation)
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
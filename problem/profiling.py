@@ -0,0 +1,132 @@
+import time
+from contextlib import nullcontext
+
+# Các pha của một lần chạy GA được đo thời gian
+PHASES = ('initialization', 'evaluation', 'selection', 'crossover', 'mutation', 'elitism')
+PROFILERS = ('phases', 'cprofile', 'tracemalloc')
+
+# Khi không bật profiler, mọi pha dùng chung context rỗng này (gần như không tốn chi phí)
+NO_PHASE = nullcontext()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.seconds[self.name] += time.perf_counter() - self.started
+        self.profiler.calls[self.name] += 1
+
+
+class Profiler:
+    # Đo tổng thời gian (wall time) và số lần gọi của từng pha, cùng số lần đánh giá fitness mỗi thế hệ.
+    # Lớp con có thể ghi đè start_run / stop_run / report để gắn thêm công cụ khác (cProfile, tracemalloc...).
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.evaluations_per_generation = []
+        self._phases = {name: _Phase(self, name) for name in PHASES}
+        self.total_seconds = 0.0
+        self._started = None
+
+    def phase(self, name):
+        return self._phases[name]
+
+    def record_generation(self, evaluations):
+        self.evaluations_per_generation.append(evaluations)
+
+    def start_run(self):
+        self._started = time.perf_counter()
+
+    def stop_run(self):
+        if self._started is not None:
+            self.total_seconds += time.perf_counter() - self._started
+            self._started = None
+
+    def report(self):
+        return {
+            "total_seconds" : self.total_seconds,
+            "seconds"       : dict(self.seconds),
+            "calls"         : dict(self.calls),
+            "evaluations_per_generation" : list(self.evaluations_per_generation),
+        }
+
+
+class CProfileProfiler(Profiler):
+    # Bật cProfile trong suốt lần chạy; report thêm bảng các hàm tốn thời gian nhất (dạng text)
+    def __init__(self, top=25, sort='cumulative'):
+        super().__init__()
+        import cProfile
+        self.top = top
+        self.sort = sort
+        self.profile = cProfile.Profile()
+
+    def start_run(self):
+        super().start_run()
+        self.profile.enable()
+
+    def stop_run(self):
+        self.profile.disable()
+        super().stop_run()
+
+    def report(self):
+        import io
+        import pstats
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats(self.sort).print_stats(self.top)
+        return dict(super().report(), cprofile=stream.getvalue())
+
+
+class TracemallocProfiler(Profiler):
+    # Theo dõi cấp phát bộ nhớ trong lần chạy: bộ nhớ đỉnh và các dòng code cấp phát nhiều nhất
+    def __init__(self, top=10):
+        super().__init__()
+        self.top = top
+        self.peak_bytes = 0
+        self.top_allocations = []
+
+    def start_run(self):
+        import tracemalloc
+        super().start_run()
+        # Không tắt tracemalloc nếu nó đã được bật từ bên ngoài
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+
+    def stop_run(self):
+        import tracemalloc
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_bytes = max(self.peak_bytes, peak)
+            stats = tracemalloc.take_snapshot().statistics('lineno')[:self.top]
+            self.top_allocations = [(str(stat.traceback), stat.size) for stat in stats]
+            if self._owns_tracing:
+                tracemalloc.stop()
+        super().stop_run()
+
+    def report(self):
+        return dict(super().report(), peak_memory_bytes=self.peak_bytes, top_allocations=self.top_allocations)
+
+
+def make_profiler(profiler):
+    # None / False: tắt; True hoặc 'phases': chỉ đo thời gian các pha; 'cprofile' / 'tracemalloc';
+    # hoặc một đối tượng Profiler (hook tự viết) dùng trực tiếp
+    if profiler is None or profiler is False:
+        return None
+    if isinstance(profiler, Profiler):
+        return profiler
+    if profiler is True or profiler == 'phases':
+        return Profiler()
+    if profiler == 'cprofile':
+        return CProfileProfiler()
+    if profiler == 'tracemalloc':
+        return TracemallocProfiler()
+    raise ValueError(f"Profiler không hợp lệ. Chọn một trong {PROFILERS} hoặc truyền một đối tượng Profiler.")
@@ -1,12 +1,7 @@
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-import pandas as pd
 import random
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from problem.knapsack import KnapsackProblem
-from problem.genetic import GeneticAlgorithm
-import threading
+from utils.jobs import BackgroundJob, JobStatus
 
 
 class GAApp:
@@ -57,7 +52,12 @@ class GAApp:
         self.param_to_change.grid(row=3, column=len(labels))
 
         tk.Button(input_frame, text="Load Excel", command=self.load_excel).grid(row=1, column=len(labels)+1, padx=5)
-        tk.Button(input_frame, text="Run Experiments", command=self.run_experiments).grid(row=3, column=len(labels)+1, padx=5)
+        self.run_button = tk.Button(input_frame, text="Run Experiments", command=self.run_experiments)
+        self.run_button.grid(row=3, column=len(labels)+1, padx=5)
+
+        # Tiến độ + nút huỷ của lượt chạy đang diễn ra (chạy ở luồng nền)
+        self.status = JobStatus(self.root)
+        self.status.pack(side=tk.TOP, fill=tk.X, padx=10)
 
         # Tabs bên dưới chiếm toàn bộ không gian còn lại
         tab_control = ttk.Notebook(self.root)
@@ -72,8 +72,17 @@ class GAApp:
         self.log_text = tk.Text(result_tab, height=10)
         self.log_text.pack(pady=5, fill=tk.BOTH, expand=True)
 
-        plot_tab = tk.Frame(tab_control)
-        tab_control.add(plot_tab, text='Biểu đồ')
+        self.plot_tab = tk.Frame(tab_control)
+        tab_control.add(self.plot_tab, text='Biểu đồ')
+        self.figure = self.ax = self.canvas = None  # tạo khi vẽ lần đầu (ensure_plot)
+
+        tk.Button(self.root, text="📈 Mở Biểu Đồ Rộng", command=self.open_fullscreen_plot).pack(pady=5)
+
+    def ensure_plot(self):
+        if self.canvas is not None:
+            return
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
         self.figure, self.ax = plt.subplots(figsize=(16, 6))
         self.ax.tick_params(labelsize=8)  # Giảm kích thước chữ của trục
@@ -81,27 +90,18 @@ class GAApp:
         self.ax.xaxis.label.set_size(9)   # Kích thước nhãn trục X
         self.ax.yaxis.label.set_size(9)   # Kích thước nhãn trục Y
 
-        self.canvas = FigureCanvasTkAgg(self.figure, master=plot_tab)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.plot_tab)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        tk.Button(self.root, text="📈 Mở Biểu Đồ Rộng", command=self.open_fullscreen_plot).pack(pady=5)
-
     def load_excel(self):
         file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
         if not file_path:
             return
+        from utils.loader import load_items
+
         try:
-            df = pd.read_excel(file_path)
             self.products.clear()
-            for _, row in df.iterrows():
-                number = len(self.products) + 1
-                self.products.append({
-                    "number": number,
-                    "name": row["name"],
-                    "weight": float(row["weight"]),
-                    "value": float(row["value"]),
-                    "Max_quantity": int(row["Max_quantity"])
-                })
+            self.products.extend(load_items(file_path))
 
             self.product_table.delete(1.0, tk.END)
             for item in self.products:
@@ -112,6 +112,8 @@ class GAApp:
             messagebox.showerror("Lỗi", f"Không đọc được file Excel: {e}")
 
     def run_experiments(self):
+        from problem.knapsack import KnapsackProblem
+
         try:
             capacity = int(self.entries["Capacity"].get())
             base_params = {
@@ -127,33 +129,37 @@ class GAApp:
             selected_indices = self.param_to_change.curselection()
             params_to_change = [self.param_to_change.get(i) for i in selected_indices] 
 
+            if len(params_to_change) > 1:
+                messagebox.showerror("Lỗi", "Vui lòng chỉ chọn tối đa 1 tham số để thay đổi.")
+                return
 
             self.problem = KnapsackProblem(self.products, capacity=capacity)
-
-            self.ax.clear()
-            self.log_text.delete(1.0, tk.END)
-            self.canvas.draw()
-
-            threading.Thread(
-                target=self.run_trials,
-                args=(base_params, runs, params_to_change, param_mode),
-                daemon=True
-            ).start()
-
+            # Đọc các widget (combobox...) ở luồng chính; luồng nền chỉ nhận danh sách tham số đã tính sẵn
+            trials = self.build_trials(base_params, runs, params_to_change, param_mode)
         except Exception as e:
             messagebox.showerror("Lỗi", f"Chưa nhập đủ dữ liệu: {e}")
+            return
 
-    def run_trials(self, base_params, runs, params_to_change, mode):
+        self.ensure_plot()
         self.ax.clear()
+        self.log_text.delete(1.0, tk.END)
+        self.canvas.draw()
 
-        if len(params_to_change) > 1:
-            messagebox.showerror("Lỗi", "Vui lòng chỉ chọn tối đa 1 tham số để thay đổi.")
-            return
-
+        self.results = [None] * runs
+        self.run_button.config(state=tk.DISABLED)
+        job = BackgroundJob(
+            self.root, lambda job: self.run_trials(job, trials),
+            on_events=lambda events: self.show_trial_results(events, trials),
+            on_progress=self.status.update_progress, on_done=self.plot_results, on_error=self.trials_failed
+        )
+        self.status.attach(job, f"Đang chạy {runs} lần...")
+        job.start()
+
+    def build_trials(self, base_params, runs, params_to_change, mode):
         params = base_params.copy()
-        results = []
-        run_numbers = []
+        trials = []
 
+        # Tính trước tham số của từng lần chạy, sau đó chạy song song tất cả
         for run in range(1, runs + 1):
             label_info = ""
 
@@ -172,23 +178,51 @@ class GAApp:
                     params["mutation_rate"] = self.modify_value(params["mutation_rate"], mode, 0.01, 1.0, run - 1)
                     label_info = f" | Mutation Rate: {params['mutation_rate']:.2f}"
 
-            ga = GeneticAlgorithm(
-                self.problem,
-                params["pop_size"],
-                params["generations"],
-                self.comboboxes["Crossover Type"].get(),
-                self.comboboxes["Selection Type"].get(),
-                self.comboboxes["Mutation Type"].get(),
-                params["crossover_rate"],
-                params["mutation_rate"]
-            )
-            logs = ga.run()
-            best_fitness = max(float(log["best"]) for log in logs)
-
-            results.append(best_fitness)
-            run_numbers.append(run)
-            self.log_text.insert(tk.END, f"[Run {run}]{label_info} → Best fitness = {best_fitness}\n")
-            self.log_text.see(tk.END)
+            trials.append((label_info, {
+                "populationSize" : params["pop_size"],
+                "generations"    : params["generations"],
+                "crossoverType"  : self.comboboxes["Crossover Type"].get(),
+                "selectionType"  : self.comboboxes["Selection Type"].get(),
+                "mutationType"   : self.comboboxes["Mutation Type"].get(),
+                "crossoverRate"  : params["crossover_rate"],
+                "mutationRate"   : params["mutation_rate"]
+            }))
+        return trials
+
+    def run_trials(self, job, trials):
+        # Chạy ở luồng nền: không chạm vào widget, chỉ gửi kết quả về qua job
+        from problem.genetic import spawn_seeds
+        from utils.sweep import DEFAULT_SEED, run_sweep
+
+        # Seed cố định theo lần chạy: bấm chạy lại chỉ tính những lần chạy chưa có trong cache
+        seeds = spawn_seeds(DEFAULT_SEED, len(trials))
+        tasks = [(ga_params, seed) for (_, ga_params), seed in zip(trials, seeds)]
+        completed = 0
+        for index, summary, from_cache in run_sweep(self.problem, tasks, cancel=job.cancel_event):
+            if summary["stopReason"] == "cancelled":
+                continue  # lần chạy bị huỷ giữa chừng không được vẽ như một lần chạy thật
+            completed += 1
+            job.emit(index, float(summary["best"]), from_cache)
+            job.report(completed, len(tasks), f"Đã xong {completed}/{len(tasks)} lần chạy")
+        return len(tasks) - completed
+
+    def show_trial_results(self, events, trials):
+        lines = []
+        for index, best_fitness, from_cache in events:
+            self.results[index] = best_fitness
+            source = " (cache)" if from_cache else ""
+            lines.append(f"[Run {index + 1}]{trials[index][0]} → Best fitness = {best_fitness}{source}\n")
+        self.log_text.insert(tk.END, "".join(lines))
+        self.log_text.see(tk.END)
+
+    def plot_results(self, dropped):
+        self.run_button.config(state=tk.NORMAL)
+        done = [(run, best) for run, best in enumerate(self.results, start=1) if best is not None]
+        skipped = f" (đã huỷ, bỏ {dropped} lần chạy chưa hoàn tất)" if dropped else ""
+        self.status.finish(f"Hoàn tất {len(done)}/{len(self.results)} lần chạy{skipped}.")
+        if not done:
+            return
+        run_numbers, results = zip(*done)
 
         self.ax.plot(run_numbers, results, label="Best Fitness", linewidth=2.0, marker='o', color='blue')
         self.ax.set_title("Best Fitness qua các lần chạy")
@@ -198,6 +232,11 @@ class GAApp:
         self.ax.legend(fontsize=8)
         self.canvas.draw()
 
+    def trials_failed(self, error):
+        self.run_button.config(state=tk.NORMAL)
+        self.status.finish("Lỗi khi chạy GA.")
+        messagebox.showerror("Lỗi", f"Lỗi khi chạy GA: {error}")
+
     def modify_value(self, value, mode, min_val, max_val, run_index=0):
         total_steps = self.runs - 1  # tránh chia cho 0 nếu runs=1
     
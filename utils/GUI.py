@@ -1,13 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 import platform
-from matplotlib.ticker import MaxNLocator
-import time
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-from problem.genetic import GeneticAlgorithm
-from problem.knapsack import KnapsackProblem
 
 
 class KnapsackUI:
@@ -197,17 +190,14 @@ class KnapsackUI:
         file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
         if not file_path:
             return
+        from utils.loader import load_items
+
         try:
-            df = pd.read_excel(file_path)
-            for _, row in df.iterrows():
-                number = len(self.products) + 1
-                self.products.append({
-                    "number": number,
-                    "name": row["name"],
-                    "weight": float(row["weight"]),
-                    "value": float(row["value"]),
-                    "Max_quantity": int(row["Max_quantity"])
-                })
+            items = load_items(file_path)
+            offset = len(self.products)
+            for item in items:
+                item["number"] += offset
+            self.products.extend(items)
             self.update_table()
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể đọc file Excel: {e}")
@@ -229,30 +219,32 @@ class KnapsackUI:
             mutation_type = self.mutation_options[self.mutation_combo.get()]
         except ValueError:
             messagebox.showerror("Lỗi", "Thông số không hợp lệ.")
-        problem = KnapsackProblem(self.products, capacity=capacity) #bài toán cần giải 
-        best_logs = []
-
-        for run_idx in range(num_runs): #? lặp nhiều lần để làm gì 
-            solver = GeneticAlgorithm(
-                problem=problem,
-                populationSize=population_size,
-                generations=generations,
-                crossoverType=crossover_type,
-                selectionType=selection_type,
-                crossoverRate= crossover_rate,
-                mutationType=mutation_type,
-                mutationRate=mutation_rate
-            )
-            logs = solver.run()
-            best_gen = max(logs, key=lambda x: x["best"]) # thế hệ tốt nhất của mỗi lần chạy - num_runs 
-            best_logs.append((best_gen["best"], run_idx, best_gen, logs))
-
-        best_fitness, best_run_idx, best_gen_log, best_run_logs = max(best_logs, key=lambda x: x[0]) # thông số của lần chạy tốt nhất 
-        print(best_gen_log)
+            return
+        from problem.knapsack import KnapsackProblem
 
-        self.show_result_window(problem, population_size, selection_type, mutation_type, generations, crossover_type, mutation_rate, best_gen_log, best_run_logs, best_fitness, best_run_idx, num_runs)
+        problem = KnapsackProblem(self.products, capacity=capacity) #bài toán cần giải 
 
-    def show_result_window(self, problem, population_size, selection_type, mutation_type, generations, crossover_type, mutation_rate, best_gen_log, best_run_logs, best_fitness, best_run_idx, num_runs):
+        ga_params = dict(
+            populationSize=population_size,
+            generations=generations,
+            crossoverType=crossover_type,
+            selectionType=selection_type,
+            crossoverRate= crossover_rate,
+            mutationType=mutation_type,
+            mutationRate=mutation_rate
+        )
+        # Cửa sổ kết quả mở ngay, biểu đồ được cập nhật trong lúc các lần chạy đang tiến hành
+        self.show_result_window(problem, ga_params, num_runs)
+
+    def show_result_window(self, problem, ga_params, num_runs):
+        from matplotlib.ticker import MaxNLocator
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from utils.chart import LiveChart
+        from utils.jobs import BackgroundJob, JobStatus
+        from utils.parallel import run_many
+
+        generations = ga_params["generations"]
         result_window = tk.Toplevel(self.root)
         result_window.title("Biểu đồ thể hiện quy trình tiến hoá")
         fig = Figure(figsize=(7, 4), dpi=100)
@@ -271,6 +263,13 @@ class KnapsackUI:
 
         canvas = FigureCanvasTkAgg(fig, master=result_window)
         canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Vẽ dần bằng blitting, số điểm gộp theo độ rộng trục: chi phí mỗi khung hình không tăng theo số thế hệ
+        chart = LiveChart(canvas, ax, [best_line, avg_line, worst_line], extremes=(0, 2), label_changes=True,
+                          x_limit=generations)
+
+        status = JobStatus(result_window)
+        status.pack(fill="x", padx=10)
+
         log_frame = tk.Frame(result_window)
         log_frame.pack(fill="both", expand=False, padx=10, pady=(0, 10))
 
@@ -281,149 +280,96 @@ class KnapsackUI:
         log_text.pack(fill="both", expand=True)
         log_text.config(state='disabled')  # Bắt đầu ở trạng thái không chỉnh sửa
 
-        log_text.config(state='normal')
-        log_text.insert("end", f"Thế hệ tốt nhất của mỗi lần chạy : {best_gen_log['generation']},Cá thể tốt nhất :{best_gen_log['bestIndividual']}, best fitness : {best_gen_log['best']}\n")
-        log_text.see("end")  # Tự động cuộn xuống cuối
-        log_text.config(state='disabled')
-
+        button_frame = tk.Frame(result_window)
+        button_frame.pack(pady=(5, 10))
 
-        generations_list, best_list, avg_list, worst_list = [], [], [], []
-        current_log_index = 0 
+        # Các lần chạy diễn ra trong tiến trình con; luồng nền (BackgroundJob) chỉ đẩy sự kiện vào hàng đợi,
+        # mọi thao tác với widget Tk đều ở luồng chính, theo lô mỗi lần poll
+        stride = max(1, generations // 200)  # khoảng 200 điểm trên biểu đồ mỗi lần chạy
 
-        def update_chart(): 
-            nonlocal current_log_index
-
-            if current_log_index >= len(best_run_logs):
-                # Khi cập nhật xong tất cả log → vẽ dòng mô tả cuối cùng
-                fig.text(
-                    0.5, 0.95,
-                    f"Lần chạy tốt nhất: {best_run_idx + 1}/{num_runs} | Fitness cao nhất: {best_fitness:.2f}",
-                    ha='center', va='bottom',
-                    fontsize=10, color='purple', fontweight='bold'
-                )
-                canvas.draw()
+        def work(job):
+            results = run_many(
+                problem, [ga_params] * num_runs, keep_logs=True, stride=stride, cancel=job.cancel_event,
+                progress=lambda index, stats: job.emit("progress", index, stats)
+            )
+            completed = 0
+            for run_idx, logs in results:
+                if logs.stop_reason == 'cancelled':
+                    continue  # lần chạy bị huỷ giữa chừng: không tính, không so sánh
+                completed += 1
+                job.emit("result", run_idx, logs)
+                job.report(completed, num_runs, f"Đã xong {completed}/{num_runs} lần chạy")
+
+        live = {}          # lần chạy → (thế hệ, best, avg, worst) đã nhận
+        # best: (lần chạy, GenerationLog) tốt nhất tới hiện tại — chỉ giữ log của một lần chạy;
+        # shown: lần chạy đang hiển thị và số điểm của nó đã đưa vào biểu đồ
+        state = {"best_gen_log": None, "best": None, "completed": 0, "shown": None, "plotted": 0}
+
+        def on_events(events):
+            dirty = False
+            for kind, index, payload in events:
+                if kind == "progress":
+                    series = live.setdefault(index, ([], [], [], []))
+                    for lst, key in zip(series, ("generation", "best", "avg", "worst")):
+                        lst.append(payload[key])
+                    dirty = True
+                else:
+                    state["completed"] += 1
+                    if state["best"] is None or payload.best_fitness > state["best"][1].best_fitness:
+                        state["best"] = (index, payload)
+            if not dirty:
                 return
-
-            log = best_run_logs[current_log_index]
-            generations_list.append(log["generation"])
-            best_list.append(log["best"])
-            avg_list.append(log["avg"])
-            worst_list.append(log["worst"])
-
-            best_line.set_data(generations_list, best_list)
-            avg_line.set_data(generations_list, avg_list)
-            worst_line.set_data(generations_list, worst_list)
-
-            for txt in ax.texts:
-                txt.remove()
-            # for i in range(1, len(generations_list) - 1):
-            #     for lst, color in [(best_list, 'green'), (avg_list, 'blue'), (worst_list, 'red')]:
-            #         prev_y, curr_y, next_y = lst[i - 1], lst[i], lst[i + 1]
-            #         if curr_y != prev_y or curr_y != next_y:
-            #             ax.annotate(f"{curr_y:.1f}", (generations_list[i], curr_y),
-            #                         textcoords="offset points", xytext=(0, 5),
-            #                         ha='center', fontsize=8, color=color)
-                    
-            def is_corner(lst, i, threshold=5):
-                if i <= 0 or i >= len(lst) - 1:
-                    return False
-                dy1 = lst[i] - lst[i - 1]
-                dy2 = lst[i + 1] - lst[i]
-                return abs(dy2 - dy1) > threshold
-
-            for i in range(1, len(generations_list) - 1):
-                if current_log_index == len(best_run_logs) - 1:
-                    max_best = max(best_list)
-                    min_best = min(best_list)
-                    idx_max_best = best_list.index(max_best)
-                    idx_min_best = best_list.index(min_best)
-
-                    ax.annotate(f"Max: {max_best:.1f}", (generations_list[idx_max_best], max_best),
-                                textcoords="offset points", xytext=(0, 10), ha='center',
-                                fontsize=9, fontweight='bold', color='green')
-                    
-                    ax.annotate(f"Min: {min_best:.1f}", (generations_list[idx_min_best], min_best),
-                                textcoords="offset points", xytext=(0, -15), ha='center',
-                                fontsize=9, fontweight='bold', color='green')
-
-                    # Worst line
-                    max_worst = max(worst_list)
-                    min_worst = min(worst_list)
-                    idx_max_worst = worst_list.index(max_worst)
-                    idx_min_worst = worst_list.index(min_worst)
-
-                    ax.annotate(f"Max: {max_worst:.1f}", (generations_list[idx_max_worst], max_worst),
-                                textcoords="offset points", xytext=(0, 10), ha='center',
-                                fontsize=9, fontweight='bold', color='red')
-
-                    ax.annotate(f"Min: {min_worst:.1f}", (generations_list[idx_min_worst], min_worst),
-                                textcoords="offset points", xytext=(0, -15), ha='center',
-                                fontsize=9, fontweight='bold', color='red')
-                gen = generations_list[i]
-                # Đánh dấu các danh sách muốn xét
-                data_series = [
-                    (best_list, 'green'),
-                    (avg_list, 'blue'),
-                    (worst_list, 'red')
-                ]
-
-                for lst, color in data_series:
-                    prev_y, curr_y, next_y = lst[i - 1], lst[i], lst[i + 1]
-                    changed = curr_y != prev_y or curr_y != next_y
-                    corner = is_corner(lst, i)
-
-                    # Nếu thay đổi nhưng KHÔNG phải khúc gấp → in nhãn
-                    if changed and not corner:
-                        ax.annotate(f"{curr_y:.1f}", (gen, curr_y),
-                                    textcoords="offset points", xytext=(0, 5),
-                                    ha='center', fontsize=8, color=color)
-
-                # Cứ 15 thế hệ → buộc in best & worst, trừ khi là khúc gấp
-                if gen % 15 == 0:
-                    if not is_corner(best_list, i):
-                        ax.annotate(f"{best_list[i]:.1f}", (gen, best_list[i]),
-                                    textcoords="offset points", xytext=(0, 5),
-                                    ha='center', fontsize=8, color='green')
-                    if not is_corner(worst_list, i):
-                        ax.annotate(f"{worst_list[i]:.1f}", (gen, worst_list[i]),
-                                    textcoords="offset points", xytext=(0, -10),
-                                    ha='center', fontsize=8, color='red')
-                        
-            # if best_list:
-            #     max_best = max(best_list)
-            #     idx_max_best = best_list.index(max_best)
-            #     gen_max_best = generations_list[idx_max_best]
-            #     ax.annotate(f"{max_best:.1f}", (gen_max_best, max_best),
-            #                 textcoords="offset points", xytext=(0, 5),
-            #                 ha='center', fontsize=8, color='green')
-
-            # if worst_list:
-            #     min_worst = min(worst_list)
-            #     idx_min_worst = worst_list.index(min_worst)
-            #     gen_min_worst = generations_list[idx_min_worst]
-            #     ax.annotate(f"{min_worst:.1f}", (gen_min_worst, min_worst),
-            #                 textcoords="offset points", xytext=(0, 5),
-            #                 ha='center', fontsize=8, color='red')
-
-            ax.relim()
-            ax.autoscale_view()
-            fig.tight_layout() 
-            canvas.draw()
-
-            current_log_index += 1
-            result_window.after(50, update_chart)  # gọi lại sau 100ms
-        #đưa vào input và gọi thuật toán 
-        update_chart()# nếu callback đc truyền và số thế hệ chia hết cho 10, tức là mỗi sau 10 thế hệ, biểu đồ sẽ được cập nhật lại 
-
-        fig.text(
-            0.5, 0.95,
-            f"Lần chạy tốt nhất: {best_run_idx + 1}/{num_runs} | Fitness cao nhất: {best_fitness:.2f}",
-            ha='center', va='bottom',
-            fontsize=10, color='purple', fontweight='bold'
-        )
-        canvas.draw()
+            # Hiển thị lần chạy đang dẫn đầu (best cao nhất tính đến hiện tại); chỉ nối thêm các điểm mới,
+            # đổi lần chạy dẫn đầu thì vẽ lại từ đầu
+            leader = max(live, key=lambda index: max(live[index][1]))
+            if leader != state["shown"]:
+                chart.clear()
+                state["shown"], state["plotted"] = leader, 0
+                ax.set_title(f"Tiến hoá qua các thế hệ (lần chạy dẫn đầu: {leader + 1})")
+            series = live[leader]
+            start = state["plotted"]
+            chart.extend_many(*(lst[start:] for lst in series))
+            state["plotted"] = len(series[0])
+            chart.refresh()
+
+        def on_error(error):
+            status.finish("Lỗi khi chạy GA.")
+            messagebox.showerror("Lỗi khi chạy GA", str(error), parent=result_window)
+
+        def finish(_):
+            if state["best"] is None:
+                status.finish("Đã huỷ, chưa có lần chạy nào hoàn tất.")
+                return
+            # Chỉ giữ log của lần chạy tốt nhất thay vì log của mọi lần chạy
+            best_run_idx, best_run_logs = state["best"]
+            best_fitness = best_run_logs.best_fitness
+            best_gen_log = best_run_logs[best_run_logs.best_generation - 1] # thế hệ tốt nhất của lần chạy đó
+            state["best_gen_log"] = best_gen_log
+            stopped = " (đã huỷ sớm)" if job.cancelled else ""
+            status.finish(f"Hoàn tất {state['completed']}/{num_runs} lần chạy{stopped}.")
+
+            log_text.config(state='normal')
+            log_text.insert("end", f"Thế hệ tốt nhất của mỗi lần chạy : {best_gen_log['generation']},Cá thể tốt nhất :{best_gen_log['bestIndividual']}, best fitness : {best_gen_log['best']}\n")
+            log_text.see("end")  # Tự động cuộn xuống cuối
+            log_text.config(state='disabled')
+
+            chart.clear()
+            chart.extend_many(
+                range(1, len(best_run_logs) + 1),
+                best_run_logs.best.tolist(), best_run_logs.avg.tolist(), best_run_logs.worst.tolist()
+            )
+            ax.set_title("Tiến hoá qua các thế hệ")
+            fig.text(
+                0.5, 0.95,
+                f"Lần chạy tốt nhất: {best_run_idx + 1}/{num_runs} | Fitness cao nhất: {best_fitness:.2f}",
+                ha='center', va='bottom',
+                fontsize=10, color='purple', fontweight='bold'
+            )
+            chart.refresh(force=True)
+            items_button.config(state=tk.NORMAL)
 
         def show_selected_items():
+            best_gen_log = state["best_gen_log"]
             item_window = tk.Toplevel(result_window)
             item_window.title("Vật phẩm được chọn - Thế hệ tốt nhất")
 
@@ -443,7 +389,18 @@ class KnapsackUI:
                     p = self.products[i]
                     item_tree.insert("", "end", values=(p["name"], qty, p["weight"], p["value"]))
 
-        tk.Button(result_window, text="Xem vật phẩm được chọn", command=show_selected_items).pack(pady=(5, 10))
+        items_button = tk.Button(button_frame, text="Xem vật phẩm được chọn", command=show_selected_items, state=tk.DISABLED)
+        items_button.pack(side="left", padx=5)
+
+        job = BackgroundJob(result_window, work, on_events=on_events, on_progress=status.update_progress,
+                            on_done=finish, on_error=on_error)
+
+        def close():
+            # Đóng cửa sổ khi đang chạy thì huỷ các lần chạy còn dở
+            job.cancel()
+            chart.close()
+            result_window.destroy()
 
-    
-     
\ No newline at end of file
+        result_window.protocol("WM_DELETE_WINDOW", close)
+        status.attach(job, f"Đang chạy {num_runs} lần...")
+        job.start()
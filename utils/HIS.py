@@ -1,13 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 from collections import Counter, defaultdict
-import threading
-import numpy as np
-from problem.knapsack import KnapsackProblem
-from problem.genetic import GeneticAlgorithm
+from utils.jobs import BackgroundJob, JobStatus
 
 class HistogramGUI(tk.Tk):
     def __init__(self):
@@ -28,7 +22,6 @@ class HistogramGUI(tk.Tk):
         }
 
         self.create_widgets()
-        self.figure, self.ax = plt.subplots(figsize=(7, 4))
 
     def create_widgets(self):
         frame_top = ttk.Frame(self)
@@ -81,10 +74,17 @@ class HistogramGUI(tk.Tk):
         self.entry_runs.insert(0, "100")
         self.entry_runs.pack(side=tk.LEFT)
 
+        # Tiến độ + nút huỷ của lượt khảo sát đang chạy (ở luồng nền)
+        self.status = JobStatus(self)
+        self.status.pack(fill=tk.X, padx=10)
+
         self.canvas_frame = ttk.Frame(self)
         self.canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def load_excel(self):
+        from problem.knapsack import KnapsackProblem
+        from utils.loader import load_items
+
         file_path = filedialog.askopenfilename(
             filetypes=[("Excel files", "*.xlsx *.xls")],
             title="Chọn file Excel chứa dữ liệu bài toán Knapsack"
@@ -93,14 +93,12 @@ class HistogramGUI(tk.Tk):
             return
 
         try:
-            df = pd.read_excel(file_path)
-            required_cols = {'name', 'weight', 'value', 'Max_quantity'}
-            if not required_cols.issubset(set(df.columns)):
-                messagebox.showerror("Lỗi", f"File Excel phải chứa các cột: {required_cols}")
+            try:
+                items = load_items(file_path)
+            except ValueError as e:
+                messagebox.showerror("Lỗi", str(e))
                 return
 
-            items = df.to_dict(orient='records')
-
             self.problem = KnapsackProblem(items, capacity=1)
             self.lbl_file.config(text=f"Đã tải file: {file_path.split('/')[-1]}")
             messagebox.showinfo("Thành công", "Đã tải bài toán từ file Excel thành công!")
@@ -135,18 +133,9 @@ class HistogramGUI(tk.Tk):
 
         self.problem.capacity = capacity
 
-        self.btn_run.config(state=tk.DISABLED)
-
-        threading.Thread(target=self._run_survey_thread).start()
-
-   
-    def _run_survey_thread(self):
+        # Đọc các ô nhập ở luồng chính; luồng nền chỉ nhận giá trị đã kiểm tra
         param_name = self.param_combo.get()
         values = self.params[param_name]
-        print(f"Đang khảo sát với {param_name} giá trị: {values}")
-
-        fitness_counter = Counter()
-
         try:
             fixed_params = {
                 "generations": int(self.entry_generations.get()),
@@ -159,61 +148,94 @@ class HistogramGUI(tk.Tk):
                 "runs": int(self.entry_runs.get())
             }
         except Exception:
-            self.after(0, messagebox.showerror, "Lỗi nhập liệu", "Vui lòng nhập đúng định dạng số cho các tham số.")
-            self.after(0, lambda: self.btn_run.config(state=tk.NORMAL))
+            messagebox.showerror("Lỗi nhập liệu", "Vui lòng nhập đúng định dạng số cho các tham số.")
             return
 
-        try:
-            for v in values:
-                param_settings = fixed_params.copy()
-                if param_name == "Generations":
-                    param_settings["generations"] = v
-                elif param_name == "Population Size":
-                    param_settings["populationSize"] = v
-                elif param_name == "Crossover Rate":
-                    param_settings["crossoverRate"] = v
-                elif param_name == "Mutation Rate":
-                    param_settings["mutationRate"] = v
-                elif param_name == "Runs":
-                    param_settings["runs"] = v
-
-                all_best_fitnesses = []
-
-                for _ in range(param_settings["runs"]):
-                    ga = GeneticAlgorithm(
-                        problem=self.problem,
-                        populationSize=param_settings["populationSize"],
-                        generations=param_settings["generations"],
-                        crossoverType=param_settings["crossoverType"],
-                        selectionType=param_settings["selectionType"],
-                        mutationType=param_settings["mutationType"],
-                        crossoverRate=param_settings["crossoverRate"],
-                        mutationRate=param_settings["mutationRate"],
-                    )
-                    logs = ga.run()
-                    best_fitnesses = [log['best'] for log in logs]
-                    all_best_fitnesses.append(best_fitnesses)
-
-                min_len = min(len(run) for run in all_best_fitnesses)
-                avg_fitness = sum([max(run[:min_len]) for run in all_best_fitnesses]) / param_settings["runs"]
-                fitness_threshold = avg_fitness * 1.1
-
-                count_over_threshold = 0
-                for run in all_best_fitnesses:
-                    if max(run[:min_len]) > fitness_threshold:
-                        count_over_threshold += 1
-
-                fitness_counter[v] = count_over_threshold
-
-            self.after(0, self.plot_histogram, fitness_counter, param_name)
+        self.btn_run.config(state=tk.DISABLED)
+        job = BackgroundJob(
+            self, lambda job: self._run_survey_job(job, param_name, values, fixed_params),
+            on_progress=self.status.update_progress,
+            on_done=lambda result: self._survey_done(*result, param_name),
+            on_error=self._survey_failed
+        )
+        self.status.attach(job, f"Đang khảo sát {param_name}...")
+        job.start()
 
-        except Exception as e:
-            self.after(0, messagebox.showerror, "Lỗi khi chạy khảo sát", str(e))
+    def _run_survey_job(self, job, param_name, values, fixed_params):
+        # Chạy ở luồng nền: không chạm vào widget, trả về (Counter, số lần chạy bị bỏ) cho on_done
+        from utils.sweep import expand_grid, run_sweep
+
+        print(f"Đang khảo sát với {param_name} giá trị: {values}")
 
-        self.after(0, lambda: self.btn_run.config(state=tk.NORMAL))
+        fitness_counter = Counter()
+
+        # Gom toàn bộ (giá trị tham số x số lần chạy) thành các task (params, seed) độc lập để chạy song song;
+        # điểm nào đã có trong cache (lần khảo sát trước, kể cả bị ngắt giữa chừng) thì không chạy lại
+        tasks = []
+        task_values = []
+        runs_per_value = {}
+        for v in values:
+            param_settings = fixed_params.copy()
+            if param_name == "Generations":
+                param_settings["generations"] = v
+            elif param_name == "Population Size":
+                param_settings["populationSize"] = v
+            elif param_name == "Crossover Rate":
+                param_settings["crossoverRate"] = v
+            elif param_name == "Mutation Rate":
+                param_settings["mutationRate"] = v
+            elif param_name == "Runs":
+                param_settings["runs"] = v
+
+            runs_per_value[v] = param_settings.pop("runs")
+            tasks.extend(expand_grid(param_settings, runs=runs_per_value[v]))
+            task_values.extend([v] * runs_per_value[v])
+
+        all_best_fitnesses = defaultdict(list)
+        completed = 0
+        for index, summary, _ in run_sweep(self.problem, tasks, cancel=job.cancel_event):
+            if summary["stopReason"] == "cancelled":
+                continue  # lần chạy bị huỷ giữa chừng không được tính vào trung bình / ngưỡng
+            completed += 1
+            all_best_fitnesses[task_values[index]].append(summary["best"])
+            job.report(completed, len(tasks), f"Đã xong {completed}/{len(tasks)} lần chạy")
+
+        for v in values:
+            best_fitnesses = all_best_fitnesses[v]
+            if not best_fitnesses:
+                continue  # bị huỷ trước khi có lần chạy nào của giá trị này
+            avg_fitness = sum(best_fitnesses) / len(best_fitnesses)
+            fitness_threshold = avg_fitness * 1.1
+
+            count_over_threshold = 0
+            for best in best_fitnesses:
+                if best > fitness_threshold:
+                    count_over_threshold += 1
+
+            fitness_counter[v] = count_over_threshold
+
+        return fitness_counter, len(tasks) - completed
+
+    def _survey_done(self, counter, dropped, param_name):
+        self.btn_run.config(state=tk.NORMAL)
+        if not counter:
+            self.status.finish("Đã huỷ, chưa có kết quả.")
+            return
+        skipped = f" (đã huỷ, bỏ {dropped} lần chạy chưa hoàn tất)" if dropped else ""
+        self.status.finish(f"Hoàn tất khảo sát{skipped}.")
+        self.plot_histogram(counter, param_name)
+
+    def _survey_failed(self, error):
+        self.btn_run.config(state=tk.NORMAL)
+        self.status.finish("Lỗi khi chạy khảo sát.")
+        messagebox.showerror("Lỗi khi chạy khảo sát", str(error))
 
 
     def plot_histogram(self, counter, param_name):
+        import numpy as np
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         if hasattr(self, 'canvas'):
             self.canvas.get_tk_widget().destroy()
             del self.canvas
@@ -0,0 +1,265 @@
+# Vẽ biểu đồ fitness theo thế hệ cập nhật liên tục với chi phí mỗi khung hình không phụ thuộc độ dài lịch sử:
+#   - dữ liệu được nối thêm dần và gộp (decimate) theo độ rộng trục tính bằng pixel (giữ min/max mỗi nhóm)
+#   - chỉ vẽ lại các đường bằng blitting trên nền đã chụp sẵn; vẽ lại toàn bộ chỉ khi phải nới trục
+#   - nhãn được thêm dần: max/min cập nhật theo giá trị chạy, nhãn điểm thay đổi chỉ xét điểm mới
+#   - giới hạn tần suất vẽ (min_interval)
+import time
+
+
+class DecimatedSeries:
+    # Mỗi nhóm (bucket) gồm bucket_size điểm liên tiếp, chỉ giữ điểm thấp nhất và cao nhất;
+    # số nhóm vượt 2 * max_buckets thì gộp từng cặp và nhân đôi bucket_size (chi phí khấu hao O(1) mỗi điểm)
+    def __init__(self, max_points=1000):
+        self.max_buckets = max(2, int(max_points) // 2)
+        self.clear()
+
+    def clear(self):
+        self.bucket_size = 1
+        self.buckets = []   # [số điểm, x_min, y_min, x_max, y_max]
+
+    def append(self, x, y):
+        buckets = self.buckets
+        if buckets and buckets[-1][0] < self.bucket_size:
+            bucket = buckets[-1]
+            bucket[0] += 1
+            if y < bucket[2]:
+                bucket[1], bucket[2] = x, y
+            if y >= bucket[4]:
+                bucket[3], bucket[4] = x, y
+            return
+        buckets.append([1, x, y, x, y])
+        if len(buckets) > 2 * self.max_buckets:
+            self._merge()
+
+    def _merge(self):
+        merged = []
+        for first, second in zip(self.buckets[0::2], self.buckets[1::2]):
+            low = first if first[2] <= second[2] else second
+            high = second if second[4] >= first[4] else first
+            merged.append([first[0] + second[0], low[1], low[2], high[3], high[4]])
+        if len(self.buckets) % 2:
+            merged.append(self.buckets[-1])
+        self.buckets = merged
+        self.bucket_size *= 2
+
+    def points(self):
+        # Tối đa 2 điểm mỗi nhóm, theo thứ tự x tăng dần
+        xs, ys = [], []
+        for _, x_low, y_low, x_high, y_high in self.buckets:
+            if x_low == x_high:
+                xs.append(x_low)
+                ys.append(y_low)
+            elif x_low < x_high:
+                xs += (x_low, x_high)
+                ys += (y_low, y_high)
+            else:
+                xs += (x_high, x_low)
+                ys += (y_high, y_low)
+        return xs, ys
+
+
+class LiveChart:
+    """Biểu đồ nhiều đường (cùng trục x) cập nhật dần trên một FigureCanvasTkAgg.
+
+    lines là các Line2D đã tạo sẵn trên ax (màu của đường dùng cho nhãn). extend() nối thêm một điểm cho
+    mọi đường, refresh() vẽ lại nếu đã qua min_interval giây kể từ lần vẽ trước (hoặc force=True).
+    x_limit: biết trước giá trị x lớn nhất (vd. số thế hệ) thì cố định trục x, không phải nới dần.
+    """
+
+    def __init__(self, canvas, ax, lines, min_interval=0.05, extremes=(), label_changes=False,
+                 label_spacing=40, corner_threshold=5, x_limit=None):
+        self.canvas = canvas
+        self.ax = ax
+        self.lines = list(lines)
+        self.min_interval = min_interval
+        self.extremes = tuple(extremes)           # chỉ số các đường có nhãn Max/Min
+        self.label_changes = label_changes        # nhãn giá trị tại điểm thay đổi (không phải khúc gấp)
+        self.label_spacing = label_spacing        # khoảng cách tối thiểu giữa hai nhãn cùng đường (pixel)
+        self.corner_threshold = corner_threshold
+        self.x_limit = x_limit
+        for line in self.lines:
+            line.set_animated(True)
+
+        self._background = None
+        self._last_draw = 0.0
+        self._scheduled = None
+        self._extreme_labels = {}
+        self.clear()
+        self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def clear(self):
+        width = max(100, int(self.ax.bbox.width))
+        self.series = [DecimatedSeries(width) for _ in self.lines]
+        self.count = 0
+        self.x_max = None
+        self.y_low = self.y_high = None
+        self._recent = [[] for _ in self.lines]   # 3 điểm gần nhất của mỗi đường (xét khúc gấp)
+        self._last_label_x = [None] * len(self.lines)
+        self._extreme_values = {}
+        for artist in getattr(self, '_labels', []):
+            artist.remove()
+        self._labels = []
+        self._pending_labels = []                 # nhãn mới chưa có trong nền đã chụp
+        for low, high in self._extreme_labels.values():
+            low.remove()
+            high.remove()
+        self._extreme_labels = {}
+        self._limits_dirty = True
+        self._fit_limits = True
+
+    def extend(self, x, *ys):
+        for index, (series, y) in enumerate(zip(self.series, ys)):
+            series.append(x, y)
+            if self.label_changes:
+                self._check_change_label(index, x, y)
+            if index in self.extremes:
+                self._update_extremes(index, x, y)
+        self.count += 1
+        low, high = min(ys), max(ys)
+        if self.x_max is None:
+            self.y_low, self.y_high = low, high
+            self._limits_dirty = True
+            self._fit_limits = True
+        else:
+            x_min, x_limit = self.ax.get_xlim()
+            y_min, y_max = self.ax.get_ylim()
+            if x > x_limit or low < y_min or high > y_max:
+                self._limits_dirty = True
+            self.y_low, self.y_high = min(self.y_low, low), max(self.y_high, high)
+        self.x_max = x
+
+    def extend_many(self, xs, *series):
+        for point in zip(xs, *series):
+            self.extend(*point)
+
+    def _check_change_label(self, index, x, y):
+        # Điểm giữa của 3 điểm gần nhất được ghi nhãn nếu giá trị thay đổi nhưng không phải khúc gấp,
+        # cách nhãn trước đủ xa (theo pixel) — mỗi điểm mới chỉ tốn O(1)
+        recent = self._recent[index]
+        recent.append((x, y))
+        if len(recent) > 3:
+            del recent[0]
+        if len(recent) < 3:
+            return
+        (_, prev_y), (mid_x, mid_y), (_, next_y) = recent
+        changed = mid_y != prev_y or mid_y != next_y
+        corner = abs((next_y - mid_y) - (mid_y - prev_y)) > self.corner_threshold
+        if not changed or corner:
+            return
+        last_x = self._last_label_x[index]
+        if last_x is not None and self._pixels(mid_x - last_x) < self.label_spacing:
+            return
+        self._last_label_x[index] = mid_x
+        label = self.ax.annotate(f"{mid_y:.1f}", (mid_x, mid_y), textcoords="offset points", xytext=(0, 5),
+                                 ha='center', fontsize=8, color=self.lines[index].get_color())
+        self._labels.append(label)
+        self._pending_labels.append(label)
+
+    def _thin_labels(self):
+        # Trục x vừa được nới (hiếm, O(log số thế hệ) lần): bỏ các nhãn nay đã quá sát nhau
+        kept, last_x = [], {}
+        for label in self._labels:
+            color = label.get_color()
+            x = label.xy[0]
+            if color in last_x and self._pixels(x - last_x[color]) < self.label_spacing:
+                label.remove()
+                continue
+            last_x[color] = x
+            kept.append(label)
+        self._labels = kept
+        self._pending_labels = [label for label in self._pending_labels if label in kept]
+
+    def _pixels(self, dx):
+        x_min, x_max = self.ax.get_xlim()
+        span = (x_max - x_min) or 1
+        return dx / span * self.ax.bbox.width
+
+    def _update_extremes(self, index, x, y):
+        color = self.lines[index].get_color()
+        values = self._extreme_values.get(index)
+        if index not in self._extreme_labels:
+            style = dict(textcoords="offset points", ha='center', fontsize=9, fontweight='bold', color=color,
+                         animated=True)
+            self._extreme_labels[index] = (
+                self.ax.annotate("", (x, y), xytext=(0, -15), **style),
+                self.ax.annotate("", (x, y), xytext=(0, 10), **style),
+            )
+        low_label, high_label = self._extreme_labels[index]
+        if values is None or y < values[0]:
+            low_label.xy = (x, y)
+            low_label.set_text(f"Min: {y:.1f}")
+        if values is None or y > values[1]:
+            high_label.xy = (x, y)
+            high_label.set_text(f"Max: {y:.1f}")
+        self._extreme_values[index] = (y if values is None else min(values[0], y),
+                                       y if values is None else max(values[1], y))
+
+    def _animated_artists(self):
+        artists = list(self.lines)
+        for pair in self._extreme_labels.values():
+            artists.extend(pair)
+        return artists
+
+    def _update_limits(self):
+        # Nới trục với khoảng dư (x gấp đôi, y thêm 25%) để ít phải vẽ lại toàn bộ
+        if self.x_max is None:
+            return
+        x_min, x_limit = self.ax.get_xlim()
+        if self._fit_limits or self.x_max > x_limit:
+            self.ax.set_xlim(0, self.x_limit if self.x_limit and self.x_max <= self.x_limit else max(10, 2 * self.x_max))
+            self._thin_labels()
+        y_min, y_max = self.ax.get_ylim()
+        if self._fit_limits or self.y_low < y_min or self.y_high > y_max:
+            margin = max(abs(self.y_high - self.y_low) * 0.25, 1.0)
+            self.ax.set_ylim(self.y_low - margin, self.y_high + margin)
+        self._fit_limits = False
+
+    def _on_draw(self, event):
+        # Sau mỗi lần vẽ toàn bộ (kể cả khi đổi kích thước cửa sổ): chụp lại nền rồi vẽ các đường lên trên
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._pending_labels = []
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for line, series in zip(self.lines, self.series):
+            line.set_data(*series.points())
+        for artist in self._animated_artists():
+            self.ax.draw_artist(artist)
+
+    def refresh(self, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last_draw < self.min_interval:
+            # Quá sớm: hẹn vẽ lại một lần sau, các lần gọi dồn trong khoảng đó gộp làm một
+            if self._scheduled is None:
+                delay = int((self.min_interval - (now - self._last_draw)) * 1000) + 1
+                widget = self.canvas.get_tk_widget()
+                self._scheduled = widget.after(delay, self._scheduled_refresh)
+            return
+        self._last_draw = now
+        if self._limits_dirty or self._background is None:
+            self._limits_dirty = False
+            self._update_limits()
+            self.canvas.draw()   # gọi _on_draw: chụp nền + vẽ các đường
+            return
+        self.canvas.restore_region(self._background)
+        if self._pending_labels:
+            # Nhãn tĩnh mới: vẽ thêm vào nền rồi chụp lại, không cần vẽ lại toàn bộ
+            for label in self._pending_labels:
+                self.ax.draw_artist(label)
+            self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._pending_labels = []
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+    def _scheduled_refresh(self):
+        self._scheduled = None
+        self.refresh(force=True)
+
+    def close(self):
+        if self._scheduled is not None:
+            try:
+                self.canvas.get_tk_widget().after_cancel(self._scheduled)
+            except Exception:
+                pass
+            self._scheduled = None
+        self.canvas.mpl_disconnect(self._draw_cid)
@@ -0,0 +1,218 @@
+# Chạy thí nghiệm GA không cần giao diện (không import tkinter / matplotlib):
+#   python -m utils.cli items.xlsx --capacity 500 --runs 20 --sweep mutationRate=0.01:0.2:0.01 -o results/
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from problem.exact import MAX_DP_CELLS, dp_cells, has_integer_weights, optimality_gap, solve_exact
+from problem.knapsack import CONSTRAINT_HANDLING, KnapsackProblem
+from utils.loader import load_items
+from problem.island import TOPOLOGIES, IslandModel
+from utils.sweep import DEFAULT_SEED, SWEEP_CACHE_DIR, expand_grid, run_sweep
+
+# Kiểu dữ liệu của các tham số GA có thể khảo sát qua --sweep
+SWEEPABLE_PARAMS = {
+    "populationSize" : int,
+    "generations"    : int,
+    "crossoverRate"  : float,
+    "mutationRate"   : float,
+    "tournamentSize" : int,
+}
+
+
+def parse_sweep(spec):
+    # "tên=v1,v2,v3" hoặc "tên=bắt_đầu:kết_thúc:bước" (kết_thúc được tính vào)
+    name, _, values = spec.partition("=")
+    if name not in SWEEPABLE_PARAMS or not values:
+        raise argparse.ArgumentTypeError(
+            f"--sweep phải có dạng <tham số>=<giá trị>, tham số thuộc {sorted(SWEEPABLE_PARAMS)}"
+        )
+    cast = SWEEPABLE_PARAMS[name]
+    if ":" in values:
+        start, stop, step = (cast(v) for v in values.split(":"))
+        if step <= 0:
+            raise argparse.ArgumentTypeError("Bước của --sweep phải dương.")
+        if start > stop:
+            raise argparse.ArgumentTypeError("Giá trị bắt đầu của --sweep phải <= giá trị kết thúc.")
+        # Không vượt quá kết_thúc; 1e-9 bù sai số làm tròn khi kết_thúc rơi đúng vào một bước
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        return name, [cast(round(start + i * step, 10)) for i in range(count)]
+    return name, [cast(v) for v in values.split(",")]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m utils.cli", description="Chạy thí nghiệm GA cho bài toán cái túi.")
+    parser.add_argument("problem", help="File Excel/CSV với các cột name, weight, value, Max_quantity")
+    parser.add_argument("--capacity", type=float, required=True)
+    parser.add_argument("--population", dest="populationSize", type=int, default=50)
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--crossover", dest="crossoverType", default="uniform", choices=["one_point", "two_points", "uniform"])
+    parser.add_argument("--selection", dest="selectionType", default="tournament", choices=["tournament", "random", "roulette"])
+    parser.add_argument("--mutation", dest="mutationType", default="uniform", choices=["uniform", "scramble"])
+    parser.add_argument("--crossover-rate", dest="crossoverRate", type=float, default=0.8)
+    parser.add_argument("--mutation-rate", dest="mutationRate", type=float, default=0.05)
+    parser.add_argument("--mutation-sampling", dest="mutationSampling", default="mask", choices=["mask", "geometric"],
+                        help="geometric: nhảy thẳng tới gene đột biến kế tiếp, nhanh hơn khi mutation rate nhỏ")
+    parser.add_argument("--tournament-size", dest="tournamentSize", type=int, default=3)
+    parser.add_argument("--representation", default="array", choices=["list", "array"])
+    parser.add_argument("--constraint", dest="constraint_handling", default="zero", choices=CONSTRAINT_HANDLING,
+                        help="Cách xử lý cá thể vượt sức chứa")
+    parser.add_argument("--penalty-factor", dest="penalty_factor", type=float, default=None)
+    parser.add_argument("--init", dest="initialization", default="random", choices=["random", "feasible"])
+    parser.add_argument("--stagnation", dest="stagnationGenerations", type=int, default=None, help="Dừng khi best không cải thiện sau N thế hệ")
+    parser.add_argument("--target", dest="targetFitness", type=float, default=None, help="Dừng khi đạt fitness mục tiêu")
+    parser.add_argument("--time-limit", dest="timeLimit", type=float, default=None, help="Giới hạn thời gian mỗi lần chạy (giây)")
+    parser.add_argument("--diversity", dest="diversityThreshold", type=float, default=None, help="Dừng khi độ đa dạng quần thể <= ngưỡng")
+    parser.add_argument("--runs", type=int, default=10, help="Số lần chạy cho mỗi giá trị tham số")
+    parser.add_argument("--sweep", type=parse_sweep, default=None, help="Tham số khảo sát, vd mutationRate=0.01:0.2:0.01")
+    parser.add_argument(
+        "--exact", default="off", choices=["off", "gap", "only", "auto"],
+        help="gap: giải chính xác để báo khoảng cách tối ưu; only: chỉ giải chính xác; "
+             "auto: bỏ qua GA nếu quy hoạch động đủ rẻ"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help="Seed gốc (mặc định cố định, như giao diện): chạy lại / chạy tiếp cùng seed dùng được cache")
+    parser.add_argument("--cache-dir", default=SWEEP_CACHE_DIR, help="Thư mục cache kết quả từng lần chạy")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="Luôn chạy lại, không đọc/ghi cache")
+    parser.add_argument("--islands", type=int, default=1,
+                        help="> 1: mỗi lần chạy là một mô hình đảo với số đảo (tiến trình) này")
+    parser.add_argument("--migration-interval", dest="migrationInterval", type=int, default=10)
+    parser.add_argument("--migration-rate", dest="migrationRate", type=float, default=0.05)
+    parser.add_argument("--topology", default="ring", choices=TOPOLOGIES)
+    parser.add_argument("--workers", type=int, default=None, help="Số tiến trình (mặc định: số CPU)")
+    parser.add_argument("--progress", type=int, default=0, metavar="N",
+                        help="In thống kê mỗi N thế hệ của từng lần chạy ngay khi có (0 = tắt)")
+    parser.add_argument("-o", "--output", default="results", help="Thư mục ghi kết quả")
+    return parser
+
+
+def run_islands(problem, tasks, args):
+    # Các lần chạy mô hình đảo được chạy lần lượt, mỗi lần đã dùng args.islands tiến trình
+    for index, (params, seed) in enumerate(tasks):
+        model = IslandModel(
+            problem, islands=args.islands, migrationInterval=args.migrationInterval,
+            migrationRate=args.migrationRate, topology=args.topology, seed=seed, **params
+        )
+        logs = model.run()
+        yield index, max(logs, key=lambda log: log.best_fitness).summary()
+
+
+def run_experiment(args):
+    problem = KnapsackProblem(
+        load_items(args.problem), capacity=args.capacity,
+        constraint_handling=args.constraint_handling, penalty_factor=args.penalty_factor
+    )
+    base_params = {
+        "populationSize" : args.populationSize,
+        "generations"    : args.generations,
+        "crossoverType"  : args.crossoverType,
+        "selectionType"  : args.selectionType,
+        "mutationType"   : args.mutationType,
+        "crossoverRate"  : args.crossoverRate,
+        "mutationRate"   : args.mutationRate,
+        "mutationSampling" : args.mutationSampling,
+        "tournamentSize" : args.tournamentSize,
+        "representation" : args.representation,
+        "initialization" : args.initialization,
+        "stagnationGenerations" : args.stagnationGenerations,
+        "targetFitness"         : args.targetFitness,
+        "timeLimit"             : args.timeLimit,
+        "diversityThreshold"    : args.diversityThreshold,
+    }
+    param_name, values = args.sweep or (None, [None])
+
+    exact = None
+    skip_ga = args.exact == "only"
+    if args.exact == "auto":
+        skip_ga = has_integer_weights(problem) and dp_cells(problem) <= MAX_DP_CELLS
+    if args.exact != "off" and (args.exact != "auto" or skip_ga):
+        exact = solve_exact(problem)
+        print(f"Lời giải chính xác ({exact['method']}, tối ưu={exact['optimal']}): {exact['value']}", flush=True)
+
+    grid = {param_name: values} if param_name else None
+    tasks = [] if skip_ga else expand_grid(base_params, grid, runs=args.runs, seed=args.seed)
+    task_keys = [(value, run + 1) for value in values for run in range(args.runs)]
+
+    def show_progress(index, stats):
+        value, run = task_keys[index]
+        label = f"{param_name}={value} " if param_name else ""
+        print(f"  [{label}run={run}] thế hệ {stats['generation']}/{tasks[index][0]['generations']}: "
+              f"best = {stats['best']}, avg = {stats['avg']:.2f}", flush=True)
+
+    rows = []
+    started = time.perf_counter()
+    if args.islands > 1:
+        results = ((index, summary, False) for index, summary in run_islands(problem, tasks, args))
+    else:
+        run_options = {"progress": show_progress, "stride": args.progress} if args.progress > 0 else {}
+        results = run_sweep(
+            problem, tasks, cache_dir=args.cache_dir, use_cache=args.use_cache, max_workers=args.workers, **run_options
+        )
+    try:
+        for index, summary, from_cache in results:
+            value, run = task_keys[index]
+            rows.append({
+                "value"      : value,
+                "run"        : run,
+                "best"       : float(summary["best"]),
+                "generation" : summary["generation"],
+                "generations_run" : summary["generations"],
+                "stop_reason"     : summary["stopReason"],
+                "gap"             : optimality_gap(float(summary["best"]), exact["value"]) if exact else None,
+            })
+            print(f"[{len(rows)}/{len(tasks)}] {param_name or 'run'}={value if param_name else run} → best = {summary['best']}"
+                  f"{' (cache)' if from_cache else ''}", flush=True)
+    except KeyboardInterrupt:
+        # Ctrl+C: dừng sớm, vẫn ghi các kết quả đã có (các điểm đã xong nằm trong cache, chạy lại để tiếp tục)
+        results.close()
+        print("Đã dừng theo yêu cầu, ghi các kết quả đã có.", flush=True)
+    elapsed = time.perf_counter() - started
+    rows.sort(key=lambda r: (values.index(r["value"]), r["run"]))
+
+    # Thống kê theo từng giá trị: giống AVG.py (best qua các lần chạy) và HIS.py (số lần vượt ngưỡng 1.1 x trung bình)
+    summary = []
+    for value in values:
+        bests = [r["best"] for r in rows if r["value"] == value]
+        mean = sum(bests) / len(bests) if bests else 0.0
+        summary.append({
+            "value"          : value,
+            "runs"           : len(bests),
+            "best"           : max(bests, default=0.0),
+            "mean"           : mean,
+            "worst"          : min(bests, default=0.0),
+            "over_threshold" : sum(1 for b in bests if b > mean * 1.1),
+            "best_gap"       : optimality_gap(max(bests), exact["value"]) if exact and bests else None,
+        })
+    return rows, summary, elapsed, exact
+
+
+def write_results(output_dir, args, rows, summary, elapsed, exact=None):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "runs.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["value", "run", "best", "generation", "generations_run", "stop_reason", "gap"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    param_name = args.sweep[0] if args.sweep else None
+    config = {k: v for k, v in vars(args).items() if k not in ("sweep", "output")}
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump({
+            "config"          : config,
+            "sweep"           : param_name,
+            "elapsed_seconds" : elapsed,
+            "exact"           : exact,
+            "summary"         : summary
+        }, f, indent=2)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    rows, summary, elapsed, exact = run_experiment(args)
+    write_results(args.output, args, rows, summary, elapsed, exact)
+    print(f"Đã ghi {len(rows)} kết quả vào {args.output} ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
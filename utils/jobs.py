@@ -0,0 +1,137 @@
+# Chạy công việc dài (nhiều lần GA, khảo sát tham số) ở luồng nền cho các giao diện Tk.
+# Luồng nền không bao giờ chạm vào widget: nó chỉ đẩy sự kiện / tiến độ vào một hàng đợi,
+# luồng chính lấy ra theo lô mỗi interval ms bằng after() rồi mới cập nhật giao diện.
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+
+class BackgroundJob:
+    """Chạy target(job) trong một luồng nền.
+
+    Trong target chỉ được gọi job.emit(...), job.report(done, total, message) và đọc job.cancelled /
+    job.cancel_event (truyền cho run_many / run_sweep để huỷ các lần chạy đang dở). Trên luồng chính:
+      on_events(list sự kiện)       gọi một lần cho mọi sự kiện tích luỹ từ lần poll trước (cập nhật theo lô)
+      on_progress(done, total, msg) chỉ nhận tiến độ mới nhất của mỗi lần poll
+      on_done(kết quả của target) / on_error(ngoại lệ) khi target kết thúc
+    Widget gắn với job bị huỷ (đóng cửa sổ) thì job tự huỷ và ngừng poll.
+    """
+
+    def __init__(self, widget, target, on_events=None, on_progress=None, on_done=None, on_error=None, interval=50):
+        self.widget = widget
+        self.target = target
+        self.on_events = on_events
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.interval = interval
+        self.cancel_event = threading.Event()
+        self._queue = queue.Queue()
+        self._thread = None
+        self.finished = False
+
+    # --- gọi từ luồng nền ---
+    def emit(self, *event):
+        self._queue.put(("event", event))
+
+    def report(self, done, total, message=""):
+        self._queue.put(("progress", (done, total, message)))
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _run(self):
+        try:
+            result = self.target(self)
+        except Exception as e:
+            self._queue.put(("error", e))
+        else:
+            self._queue.put(("done", result))
+
+    # --- gọi từ luồng chính ---
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(self.interval, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _poll(self):
+        try:
+            alive = bool(self.widget.winfo_exists())
+        except tk.TclError:
+            alive = False
+        if not alive:
+            self.cancel()
+            return
+
+        events, progress, outcome = [], None, None
+        try:
+            while True:
+                kind, payload = self._queue.get_nowait()
+                if kind == "event":
+                    events.append(payload)
+                elif kind == "progress":
+                    progress = payload
+                else:
+                    outcome = (kind, payload)
+                    break
+        except queue.Empty:
+            pass
+
+        if events and self.on_events:
+            self.on_events(events)
+        if progress and self.on_progress:
+            self.on_progress(*progress)
+        if outcome is None:
+            self.widget.after(self.interval, self._poll)
+            return
+
+        self.finished = True
+        kind, payload = outcome
+        if kind == "done" and self.on_done:
+            self.on_done(payload)
+        elif kind == "error":
+            if self.on_error:
+                self.on_error(payload)
+            else:
+                from tkinter import messagebox
+                messagebox.showerror("Lỗi", str(payload), parent=self.widget.winfo_toplevel())
+
+
+class JobStatus(tk.Frame):
+    # Thanh tiến độ + dòng trạng thái + nút huỷ dùng chung cho các cửa sổ chạy BackgroundJob
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.job = None
+        self.progressbar = ttk.Progressbar(self, mode="determinate", length=200)
+        self.progressbar.pack(side="left", padx=5)
+        self.message = tk.StringVar(value="")
+        tk.Label(self, textvariable=self.message, anchor="w").pack(side="left", fill="x", expand=True, padx=5)
+        self.cancel_button = tk.Button(self, text="Huỷ", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side="right", padx=5)
+
+    def attach(self, job, message="Đang chạy..."):
+        self.job = job
+        self.progressbar.config(value=0, maximum=1)
+        self.message.set(message)
+        self.cancel_button.config(state=tk.NORMAL)
+
+    def update_progress(self, done, total, message=""):
+        self.progressbar.config(maximum=max(total, 1), value=done)
+        self.message.set(message or f"{done}/{total}")
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.message.set("Đang huỷ...")
+
+    def finish(self, message=""):
+        self.job = None
+        self.cancel_button.config(state=tk.DISABLED)
+        self.message.set(message)
@@ -0,0 +1,83 @@
+import csv
+import hashlib
+import os
+import numpy as np
+
+REQUIRED_COLUMNS = ("name", "weight", "value", "Max_quantity")
+CACHE_DIR = os.environ.get("KNAPSACK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ai_ga"))
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_columns(path):
+    # Đọc theo cột (vector hoá), không duyệt từng dòng bằng iterrows
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            missing = set(REQUIRED_COLUMNS) - set(reader.fieldnames or [])
+            rows = list(reader)
+        columns = {col: [row.get(col) for row in rows] for col in REQUIRED_COLUMNS}
+    else:
+        import pandas as pd
+        df = pd.read_excel(path)
+        missing = set(REQUIRED_COLUMNS) - set(df.columns)
+        columns = {col: df[col].to_numpy() for col in REQUIRED_COLUMNS if col in df.columns}
+    if missing:
+        raise ValueError(f"File phải chứa các cột: {set(REQUIRED_COLUMNS)}")
+
+    return {
+        "names"          : np.asarray(columns["name"]).astype(str),
+        "weights"        : np.asarray(columns["weight"], dtype=float),
+        "values"         : np.asarray(columns["value"], dtype=float),
+        "max_quantities" : np.asarray(columns["Max_quantity"], dtype=float).astype(np.int64),
+    }
+
+
+def load_problem_arrays(path, cache_dir=CACHE_DIR, use_cache=True):
+    # Lần đầu đọc Excel/CSV rồi lưu bản .npz theo hash nội dung file; các lần sau chỉ đọc .npz
+    cache_path = None
+    if use_cache:
+        cache_path = os.path.join(cache_dir, file_hash(path) + ".npz")
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as data:
+                return {key: data[key] for key in data.files}
+
+    arrays = _read_columns(path)
+    if cache_path:
+        tmp_path = cache_path + ".tmp.npz"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Cache chỉ để tăng tốc: không ghi được (thư mục chỉ đọc, đầy đĩa) thì vẫn trả về dữ liệu đã đọc
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return arrays
+
+
+def load_items(path, cache_dir=CACHE_DIR, use_cache=True):
+    arrays = load_problem_arrays(path, cache_dir, use_cache)
+    return [
+        {
+            "number"       : number,
+            "name"         : name,
+            "weight"       : weight,
+            "value"        : value,
+            "Max_quantity" : max_qty
+        }
+        for number, (name, weight, value, max_qty) in enumerate(zip(
+            arrays["names"].tolist(),
+            arrays["weights"].tolist(),
+            arrays["values"].tolist(),
+            arrays["max_quantities"].tolist()
+        ), start=1)
+    ]
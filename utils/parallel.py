@@ -0,0 +1,111 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from problem.genetic import GeneticAlgorithm, spawn_seeds
+
+# Bài toán được gửi sang mỗi tiến trình con một lần duy nhất (qua initializer)
+_worker_problem = None
+
+
+def _init_worker(problem):
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _run_task(ga_params, seed, keep_logs, index=None, progress_queue=None, stride=10, stop_event=None):
+    # Task còn chờ trong hàng đợi khi đã bị huỷ thì không chạy: trả về None (run_many bỏ qua)
+    if stop_event is not None and stop_event.is_set():
+        return None
+    # Không cần log đầy đủ thì GA chỉ giữ thống kê tổng hợp (bộ nhớ O(1) mỗi lần chạy)
+    ga_params = dict(ga_params)
+    ga_params.setdefault("logMode", "full" if keep_logs else "summary")
+    ga = GeneticAlgorithm(_worker_problem, seed=seed, **ga_params)
+    if progress_queue is None and stop_event is None:
+        logs = ga.run()
+    else:
+        # Gửi thống kê từng stride thế hệ về tiến trình chính; hàng đợi có giới hạn nên GA
+        # tự chờ khi bên nhận chưa xử lý kịp (back-pressure). Bị huỷ thì dừng ở lần gửi kế tiếp.
+        stream = ga.run_iter(stride)
+        for stats in stream:
+            if progress_queue is not None:
+                progress_queue.put((index, stats))
+            if stop_event is not None and stop_event.is_set():
+                stream.close()
+                break
+        logs = ga.logs
+    return logs if keep_logs else logs.summary()
+
+
+def _drain_progress(progress_queue, progress, cancel, stop_event):
+    # Luồng nền ở tiến trình chính: chuyển thống kê từ các tiến trình con tới callback progress
+    # và báo huỷ cho các tiến trình con khi cancel được bật
+    while True:
+        if cancel is not None and cancel.is_set():
+            stop_event.set()
+        try:
+            item = progress_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is None:
+            return
+        if progress is not None:
+            try:
+                progress(*item)
+            except Exception:
+                pass  # callback lỗi không được làm tắc hàng đợi (tiến trình con sẽ bị chặn khi put)
+
+
+def run_many(problem, tasks, seed=None, max_workers=None, keep_logs=False, seeds=None,
+             progress=None, stride=10, cancel=None, max_pending=256):
+    """Chạy song song nhiều lần GA độc lập trên một ProcessPoolExecutor.
+
+    tasks là danh sách tham số (kwargs) cho GeneticAlgorithm, mỗi phần tử một lần chạy.
+    Kết quả được trả về dần theo thứ tự hoàn thành dưới dạng (chỉ số task, kết quả);
+    kết quả là GenerationLog đầy đủ nếu keep_logs=True, ngược lại là GenerationLog.summary().
+    seeds (tuỳ chọn) cho sẵn seed của từng task thay vì sinh từ seed gốc.
+
+    progress(chỉ số task, thống kê) được gọi từ một luồng nền mỗi stride thế hệ của mỗi lần chạy;
+    tối đa max_pending thống kê chờ xử lý, quá thì các lần chạy tạm dừng chờ. cancel (threading.Event)
+    được bật thì các lần chạy đang dở dừng ở lần gửi kế tiếp (stop_reason='cancelled'),
+    các task chưa bắt đầu thì không chạy và không được trả về.
+    """
+    tasks = list(tasks)
+    seeds = spawn_seeds(seed, len(tasks)) if seeds is None else list(seeds)
+    manager = progress_queue = stop_event = drain = None
+    if progress is not None or cancel is not None:
+        from multiprocessing import Manager
+        manager = Manager()
+        progress_queue = manager.Queue(max_pending)
+        stop_event = manager.Event()
+        drain = threading.Thread(
+            target=_drain_progress, args=(progress_queue, progress, cancel, stop_event), daemon=True
+        )
+        drain.start()
+
+    # Không tạo nhiều tiến trình con hơn số task (với fork, mọi tiến trình con được tạo ngay từ đầu)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks)) or 1
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(problem,)) as executor:
+        futures = {
+            executor.submit(
+                _run_task, params, task_seed, keep_logs, index,
+                progress_queue if progress is not None else None, stride, stop_event
+            ): index
+            for index, (params, task_seed) in enumerate(zip(tasks, seeds))
+        }
+        try:
+            for future in as_completed(futures):
+                # Bỏ tham chiếu tới future đã xong để kết quả (có thể là log đầy đủ) được giải phóng sau khi trả về
+                index = futures.pop(future)
+                result = future.result()
+                if result is not None:
+                    yield index, result
+        finally:
+            # Dừng sớm (generator bị đóng) thì huỷ các task chưa chạy và báo các task đang chạy dừng lại
+            if stop_event is not None and futures:
+                stop_event.set()
+            executor.shutdown(cancel_futures=True)
+            if manager is not None:
+                progress_queue.put(None)
+                drain.join()
+                manager.shutdown()
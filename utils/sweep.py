@@ -0,0 +1,119 @@
+# Khảo sát tham số có cache trên đĩa: mỗi điểm (cấu hình GA, seed) được lưu thành một file JSON
+# theo hash của bài toán, nên chạy lại chỉ tính các điểm còn thiếu và khảo sát bị ngắt được chạy tiếp.
+import hashlib
+import itertools
+import json
+import os
+import numpy as np
+from problem.genetic import spawn_seeds
+from utils.loader import CACHE_DIR
+from utils.parallel import run_many
+
+SWEEP_CACHE_DIR = os.path.join(CACHE_DIR, "sweeps")
+# Tăng khi thuật toán đổi khiến cùng (cấu hình, seed) cho kết quả khác
+CACHE_VERSION = 2
+# Seed gốc mặc định của giao diện: bấm chạy lại cùng tham số sẽ lấy kết quả từ cache
+DEFAULT_SEED = 0
+
+
+def problem_hash(problem):
+    digest = hashlib.sha256()
+    for array in (problem.weights, problem.values, problem.max_quantities):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(repr((float(problem.capacity), problem.constraint_handling, float(problem.penalty_factor))).encode())
+    return digest.hexdigest()
+
+
+def expand_grid(base_params, grid=None, runs=1, seed=DEFAULT_SEED):
+    # grid: {tên tham số: [giá trị, ...]} → danh sách task (params, seed), mỗi tổ hợp giá trị chạy runs lần.
+    # Lần chạy thứ i của mọi tổ hợp dùng chung seed thứ i (so sánh các cấu hình trên cùng dãy ngẫu nhiên).
+    grid = grid or {}
+    seeds = spawn_seeds(seed, runs)
+    tasks = []
+    for combination in itertools.product(*grid.values()):
+        params = dict(base_params, **dict(zip(grid.keys(), combination)))
+        tasks.extend((params, task_seed) for task_seed in seeds)
+    return tasks
+
+
+def _jsonable(summary):
+    return {
+        "best"           : float(summary["best"]),
+        "generation"     : int(summary["generation"]),
+        "bestIndividual" : None if summary["bestIndividual"] is None else np.asarray(summary["bestIndividual"]).tolist(),
+        "generations"    : int(summary["generations"]),
+        "stopReason"     : summary["stopReason"],
+    }
+
+
+class SweepCache:
+    def __init__(self, problem, cache_dir=SWEEP_CACHE_DIR):
+        self.directory = os.path.join(cache_dir, problem_hash(problem))
+
+    @staticmethod
+    def cacheable(params):
+        # Chạy có giới hạn thời gian không tái lập được theo seed
+        return params.get("timeLimit") is None
+
+    def path(self, params, seed):
+        key = json.dumps({"version": CACHE_VERSION, "params": params, "seed": seed}, sort_keys=True, default=str)
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, params, seed):
+        try:
+            with open(self.path(params, seed)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, params, seed, summary):
+        path = self.path(params, seed)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(summary, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Cache chỉ để tiếp tục / tăng tốc: không ghi được (thư mục chỉ đọc, đầy đĩa) thì bỏ qua,
+            # khảo sát vẫn tiếp tục và kết quả vẫn được trả về
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def run_sweep(problem, tasks, cache_dir=SWEEP_CACHE_DIR, use_cache=True, max_workers=None, progress=None, **run_options):
+    """Chạy các task (params, seed) của một khảo sát, bỏ qua những điểm đã có trong cache.
+
+    Trả về dần (chỉ số task, summary, lấy_từ_cache): các điểm có sẵn trước, sau đó các điểm
+    vừa tính theo thứ tự hoàn thành. Mỗi điểm được ghi vào cache ngay khi xong, nên dừng giữa
+    chừng (đóng cửa sổ, Ctrl+C) thì lần chạy sau tiếp tục từ chỗ còn thiếu.
+    progress / stride / cancel được chuyển cho run_many (chỉ số task trong progress là chỉ số trong tasks);
+    lần chạy bị huỷ không được ghi vào cache.
+    """
+    tasks = list(tasks)
+    cache = SweepCache(problem, cache_dir) if use_cache else None
+    missing = []
+    for index, (params, seed) in enumerate(tasks):
+        summary = cache.get(params, seed) if cache and cache.cacheable(params) else None
+        if summary is None:
+            missing.append(index)
+        else:
+            yield index, summary, True
+
+    if not missing:
+        return
+    if progress is not None:
+        run_options["progress"] = lambda position, stats: progress(missing[position], stats)
+    results = run_many(
+        problem, [tasks[i][0] for i in missing], seeds=[tasks[i][1] for i in missing], max_workers=max_workers,
+        **run_options
+    )
+    for position, summary in results:
+        index = missing[position]
+        params, seed = tasks[index]
+        summary = _jsonable(summary)
+        if cache and cache.cacheable(params) and summary["stopReason"] != "cancelled":
+            cache.put(params, seed, summary)
+        yield index, summary, False